@@ -1,57 +1,195 @@
+from concurrent.futures import ThreadPoolExecutor
+from queue import Full, Queue
+from WiktionaryDatabase import WiktionaryDatabase
+import argparse
+import os
+import threading
+
 wiktionary_fp = 'outputs/WiktionaryOutput_old.csv'
+registry_fp = 'inputs/EtymologyDicts/sources.csv'  # Extra sources, one "path,columns,lang,src_lang,citation" per line
+combined_fp = 'outputs/CombinedDictionaries.csv'
+sqlite_fp = None  # Set to e.g. 'outputs/CombinedDictionaries.db' to also load the combined data into SQLite
+
+combined_columns = ('word', 'lang', 'src_lang', 'src_word', 'src_rom', 'pos', 'relation', 'citation')
+combined_indexes = (('word', 'lang'), ('src_lang', 'src_word'), ('relation',))
+merge_key_columns = (0, 1, 2, 3)  # word, lang, src_lang, src_word
 
 
 def create_data_dict(word, lang, src_lang, src_word='', src_rom='', pos='', relation='', citation=''):
     return word, lang, src_lang, src_word, src_rom, pos, relation, citation
 
 
-data = []
+# A dictionary file and its column layout. Columns are named after the fields of create_data_dict; other names (e.g.
+# '_') are skipped. Fields that are not columns of the file take the fixed values given here.
+class DictionarySource(object):
+    __slots__ = ('path', 'columns', 'lang', 'src_lang', 'citation')
+
+    def __init__(self, path, columns, lang='', src_lang='', citation=''):
+        self.path = path
+        self.columns = tuple(columns)
+        self.lang = lang
+        self.src_lang = src_lang
+        self.citation = citation
+
+    def read_rows(self, chunk_size=10000):
+        chunk = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                values = line.strip().split(',')
+                if len(values) != len(self.columns):
+                    continue
+                fields = {'lang': self.lang, 'src_lang': self.src_lang, 'citation': self.citation}
+                fields.update(zip(self.columns, values))
+                chunk.append(create_data_dict(fields['word'], fields['lang'], fields['src_lang'],
+                                              fields.get('src_word', ''), fields.get('src_rom', ''),
+                                              fields.get('pos', ''), fields.get('relation', ''), fields['citation']))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+        if len(chunk):
+            yield chunk
+
+
+default_sources = [
+    DictionarySource(wiktionary_fp, ('word', 'lang', 'pos', 'src_lang', 'src_word', 'relation', 'citation')),
+    DictionarySource('inputs/EtymologyDicts/HIL_loanwords_ES.csv', ('word', 'src_word'), 'hil', 'spa', 'kau'),
+    DictionarySource('inputs/EtymologyDicts/ID_loanwords_AR.csv', ('word', 'src_word', 'src_rom'), 'ind', 'ara', 'wkp'),
+    DictionarySource('inputs/EtymologyDicts/ID_loanwords_SA.csv', ('word', 'src_word', 'src_rom'), 'ind', 'san', 'wkp'),
+    DictionarySource('inputs/EtymologyDicts/ID_loanwords_EN.csv', ('word', 'src_word'), 'ind', 'eng', 'wkp'),
+    DictionarySource('inputs/EtymologyDicts/ID_loanwords_NL.csv', ('word', 'src_word'), 'ind', 'nld', 'wkp'),
+    DictionarySource('inputs/EtymologyDicts/ID_loanwords_PT.csv', ('word', 'src_word'), 'ind', 'por', 'wkp'),
+    # TODO: Process SRN data
+]
+
 
-count = 0
+# Sources listed in the registry file, e.g. "inputs/EtymologyDicts/SRN_loanwords_NL.csv,word|src_word,srn,nld,wkp"
+def load_registry(filepath=registry_fp):
+    sources = []
+    if not os.path.exists(filepath):
+        return sources
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not len(line) or line[0] == '#':
+                continue
+            path, columns, lang, src_lang, citation = line.split(',')
+            sources.append(DictionarySource(path, columns.split('|'), lang, src_lang, citation))
+    return sources
 
-with open(wiktionary_fp, 'r', encoding='utf-8') as f:
-    for line in f:
+
+# Read every source in a pool of threads. Chunks of rows are handed to the caller through a bounded queue, tagged with
+# the position of their source in the list, as soon as they are read. Readers give up when the caller stops early
+# (the generator is closed, or the caller raises), so that the pool never waits on a full queue.
+def stream_sources(sources, workers=8, max_chunks=64):
+    queue = Queue(max_chunks)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                queue.put(item, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def read_source(priority, source):
         try:
-            word, lang, pos, src_lang, src_word, relation, citation = line.strip().split(',')
-            data.append(create_data_dict(word, lang, src_lang, src_word, pos=pos, relation=relation, citation=citation))
-            if lang == 'ind' and src_lang == 'nld' and relation == 'bor':
-                count += 1
-        except ValueError:
-            continue
-
-with open('inputs/EtymologyDicts/HIL_loanwords_ES.csv', 'r', encoding='utf-8') as f:
-    for line in f:
-        word, src_word = line.strip().split(',')
-        data.append(create_data_dict(word, 'hil', 'spa', src_word, citation='kau'))
-
-with open('inputs/EtymologyDicts/ID_loanwords_AR.csv', 'r', encoding='utf-8') as f:
-    for line in f:
-        word, src_word, src_rom = line.strip().split(',')
-        data.append(create_data_dict(word, 'ind', 'ara', src_word, src_rom=src_rom, citation='wkp'))
-
-with open('inputs/EtymologyDicts/ID_loanwords_SA.csv', 'r', encoding='utf-8') as f:
-    for line in f:
-        word, src_word, src_rom = line.strip().split(',')
-        data.append(create_data_dict(word, 'ind', 'san', src_word, src_rom=src_rom, citation='wkp'))
-
-with open('inputs/EtymologyDicts/ID_loanwords_EN.csv', 'r', encoding='utf-8') as f:
-    for line in f:
-        word, src_word = line.strip().split(',')
-        data.append(create_data_dict(word, 'ind', 'eng', src_word, citation='wkp'))
-
-with open('inputs/EtymologyDicts/ID_loanwords_NL.csv', 'r', encoding='utf-8') as f:
-    for line in f:
-        word, src_word = line.strip().split(',')
-        data.append(create_data_dict(word, 'ind', 'nld', src_word, citation='wkp'))
-
-with open('inputs/EtymologyDicts/ID_loanwords_PT.csv', 'r', encoding='utf-8') as f:
-    for line in f:
-        word, src_word = line.strip().split(',')
-        data.append(create_data_dict(word, 'ind', 'por', src_word, citation='wkp'))
-
-# TODO: Process SRN data
-
-# for entry in sorted(data):
-#     print(entry)
-
-print(count)
+            for chunk in source.read_rows():
+                if not put((priority, chunk)):
+                    return
+        finally:
+            put((priority, done))
+
+    with ThreadPoolExecutor(workers) as executor:
+        try:
+            futures = [executor.submit(read_source, priority, source) for priority, source in enumerate(sources)]
+            remaining = len(sources)
+            while remaining:
+                priority, chunk = queue.get()
+                if chunk is done:
+                    remaining -= 1
+                else:
+                    yield priority, chunk
+            for future in futures:
+                future.result()  # Re-raise errors from the readers
+        finally:
+            stop.set()
+
+
+# Deduplicates rows across sources on (word, lang, src_lang, src_word). Each key maps to its row, or to a list of
+# (source position, row) once a duplicate arrives; duplicates are resolved in source order, so the result does not
+# depend on which thread finished first.
+class DictionaryMerger(object):
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, priority, rows):
+        for row in rows:
+            key = tuple([row[i] for i in merge_key_columns])
+            existing = self.rows.get(key)
+            if existing is None:
+                self.rows[key] = (priority, row)
+            elif type(existing) is list:
+                existing.append((priority, row))
+            else:
+                self.rows[key] = [existing, (priority, row)]
+
+    # The row from the first source wins. Its empty fields are filled in from the other sources in order, and the
+    # citations of all sources are kept.
+    @staticmethod
+    def combine(duplicates):
+        duplicates.sort(key=lambda x: x[0])
+        combined = list(duplicates[0][1])
+        citations = [combined[-1]]
+        for _, row in duplicates[1:]:
+            for i, value in enumerate(row[:-1]):
+                if not len(combined[i]):
+                    combined[i] = value
+            if row[-1] not in citations:
+                citations.append(row[-1])
+        combined[-1] = '/'.join([c for c in citations if len(c)])
+        return tuple(combined)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        for key in sorted(self.rows):
+            existing = self.rows[key]
+            if type(existing) is list:
+                yield self.combine(existing)
+            else:
+                yield existing[1]
+
+
+def combine_dictionaries(sources, workers=8):
+    merger = DictionaryMerger()
+    for priority, chunk in stream_sources(sources, workers):
+        merger.add(priority, chunk)
+    return merger
+
+
+def write_combined(merger, filepath=combined_fp, sqlite_filepath=None):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        for row in merger:
+            f.write(','.join(row) + '\n')
+    if sqlite_filepath is not None:
+        with WiktionaryDatabase(sqlite_filepath, 'loanwords', combined_columns, combined_indexes) as db:
+            for row in merger:
+                db.write_rows([row])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Combine Wiktionary etymologies with other loanword dictionaries')
+    parser.add_argument('--registry', default=registry_fp, help='CSV file listing additional dictionary sources')
+    parser.add_argument('--output', default=combined_fp, help='Path of the combined CSV file')
+    parser.add_argument('--sqlite', default=sqlite_fp, help='Also load the combined data into this SQLite database')
+    parser.add_argument('--workers', type=int, default=8, help='Number of sources read at the same time')
+    args = parser.parse_args()
+
+    all_sources = default_sources + load_registry(args.registry)
+    combined = combine_dictionaries(all_sources, args.workers)
+    write_combined(combined, args.output, args.sqlite)
+    print('{} rows from {} sources'.format(len(combined), len(all_sources)))
@@ -0,0 +1,291 @@
+import argparse
+import pickle
+from array import array
+from collections import deque
+from WiktionaryEntry import OUTPUT_COLUMNS
+
+RELATIONS = ('inh', 'bor', 'der', 'cal', 'cog')
+RELATION_CODES = {relation: code for code, relation in enumerate(RELATIONS)}
+ANCESTRY_RELATIONS = ('inh', 'bor', 'der', 'cal')  # Cognates are relatives, not ancestors
+BORROWING_RELATIONS = ('bor', 'cal')
+
+WORD = OUTPUT_COLUMNS.index('word')
+LANG = OUTPUT_COLUMNS.index('lang')
+ROOT_LANG = OUTPUT_COLUMNS.index('root_lang')
+NONSTANDARD_ROOT_CODE = OUTPUT_COLUMNS.index('nonstandard_root_code')
+ROOT_WORD = OUTPUT_COLUMNS.index('root_word')
+RELATION = OUTPUT_COLUMNS.index('relation')
+DIST = OUTPUT_COLUMNS.index('dist')
+
+
+# Etymology graph over (lang, word) nodes. Nodes are interned to integer IDs and their names packed into one UTF-8
+# buffer; edges point from a word to its source and are stored as CSR arrays (an offsets array into flat target and
+# relation-code arrays), once in each direction. After finalize() there are no per-node Python objects.
+class EtymologyGraph(object):
+    def __init__(self):
+        # Only used while building
+        self.ids = {}
+        self.names = []
+        self.edge_src = array('I')
+        self.edge_dst = array('I')
+        self.edge_rel = array('B')
+
+        self.name_offsets = array('Q')
+        self.name_buffer = b''
+        self.sorted_ids = array('I')  # Node IDs ordered by name, for lookups by binary search
+        self.parents = None  # CSR (offsets, targets, relations): word -> sources
+        self.children = None  # CSR (offsets, targets, relations): source -> words derived from it
+
+    @staticmethod
+    def get_key(lang, word):
+        return '{}\t{}'.format(lang, word)
+
+    def intern(self, lang, word):
+        key = self.get_key(lang, word)
+        node = self.ids.get(key)
+        if node is None:
+            node = self.ids[key] = len(self.names)
+            self.names.append(key)
+        return node
+
+    def add_edge(self, lang, word, root_lang, root_word, relation):
+        if relation not in RELATION_CODES or not len(word) or not len(root_word):
+            return
+        self.edge_src.append(self.intern(lang, word))
+        self.edge_dst.append(self.intern(root_lang, root_word))
+        self.edge_rel.append(RELATION_CODES[relation])
+
+    # Merged link lists of one WiktionaryEntry (see WiktionaryEntry.to_final_list). Within an etymology, links with dist
+    # 1 link the word to its immediate source and links with dist n link the sources at dist n-1 to theirs; links with
+    # dist 0 are cognates of the word. Sources of different etymologies of a homograph are never linked to each other.
+    def add_entry(self, entry):
+        chains = {}  # etym_number -> chain, where chain[d] holds the source nodes at dist d + 1
+        for link in sorted(entry.to_final_list(), key=lambda x: (x[-1], x[-2])):
+            word, lang, root_word, relation, dist, etym_number = link[0], link[1], link[6], link[9], link[10], link[11]
+            root_lang = link[4] or link[5]
+            if dist == 0:
+                self.add_edge(lang, word, root_lang, root_word, relation)
+                continue
+            if not len(root_word):
+                continue
+
+            chain = chains.setdefault(etym_number, [])
+            if dist == 1:
+                children = [self.intern(lang, word)]
+            elif dist - 2 < len(chain):
+                children = chain[dist - 2]
+            else:
+                continue
+            node = self.intern(root_lang, root_word)
+            for child in children:
+                self.edge_src.append(child)
+                self.edge_dst.append(node)
+                self.edge_rel.append(RELATION_CODES.get(relation, RELATION_CODES['der']))
+
+            while len(chain) < dist:
+                chain.append([])
+            chain[dist - 1].append(node)
+
+    # Entries parsed straight from a dump, which keep the etymology of every link
+    def add_wiktionary_dump(self, dump_fp, dump_index_fp=None):
+        from WiktionaryExtractor import WiktionaryExtractor
+        extractor = WiktionaryExtractor()
+        extractor.wiktionary_dump_filepath = dump_fp
+        extractor.dump_index_filepath = dump_index_fp
+        for entry in extractor.iter_entries():
+            self.add_entry(entry)
+
+    # Rows of the extracted CSV. Rows do not say which etymology of a homograph they belong to, so only the links of
+    # words to their immediate sources (dist 1) and to cognates (dist 0) are added; build from the dump for full chains.
+    def add_wiktionary_csv(self, csv_fp='outputs/WiktionaryOutput.csv'):
+        with open(csv_fp, 'r', encoding='utf-8') as f:
+            for line in f:
+                row = line.rstrip('\n').split(',')
+                if len(row) != len(OUTPUT_COLUMNS) or row[DIST] not in ('0', '1'):
+                    continue
+                relation = row[RELATION]
+                if row[DIST] == '1' and relation not in RELATION_CODES:
+                    relation = 'der'
+                self.add_edge(row[LANG], row[WORD], row[ROOT_LANG] or row[NONSTANDARD_ROOT_CODE], row[ROOT_WORD],
+                              relation)
+
+    # Loanword rows from CombineDictionaries: (word, lang, src_lang, src_word, src_rom, pos, relation, citation)
+    def add_loanwords(self, rows):
+        for word, lang, src_lang, src_word, _, _, relation, _ in rows:
+            self.add_edge(lang, word, src_lang, src_word, relation or 'bor')
+
+    @staticmethod
+    def build_csr(node_count, src, dst, rel):
+        offsets = zeros('Q', node_count + 1)
+        for s in src:
+            offsets[s + 1] += 1
+        for i in range(node_count):
+            offsets[i + 1] += offsets[i]
+
+        targets = zeros('I', len(src))
+        relations = zeros('B', len(src))
+        fill = array('Q', offsets)
+        for s, d, r in zip(src, dst, rel):
+            targets[fill[s]] = d
+            relations[fill[s]] = r
+            fill[s] += 1
+        return offsets, targets, relations
+
+    # Pack node names and build the CSR arrays; no more rows can be added afterwards
+    def finalize(self):
+        node_count = len(self.names)
+        encoded = [name.encode('utf-8') for name in self.names]
+        self.name_offsets = array('Q', [0])
+        for name in encoded:
+            self.name_offsets.append(self.name_offsets[-1] + len(name))
+        self.name_buffer = b''.join(encoded)
+        self.sorted_ids = array('I', sorted(range(node_count), key=encoded.__getitem__))
+        del encoded
+
+        self.parents = self.build_csr(node_count, self.edge_src, self.edge_dst, self.edge_rel)
+        self.children = self.build_csr(node_count, self.edge_dst, self.edge_src, self.edge_rel)
+
+        self.ids = {}
+        self.names = []
+        self.edge_src = array('I')
+        self.edge_dst = array('I')
+        self.edge_rel = array('B')
+
+    def __len__(self):
+        return len(self.name_offsets) - 1
+
+    def get_name(self, node):
+        return self.name_buffer[self.name_offsets[node]:self.name_offsets[node + 1]]
+
+    def node_to_pair(self, node):
+        lang, word = self.get_name(node).decode('utf-8').split('\t', 1)
+        return lang, word
+
+    def node_id(self, lang, word):
+        key = self.get_key(lang, word).encode('utf-8')
+        lo, hi = 0, len(self.sorted_ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.get_name(self.sorted_ids[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self.sorted_ids) and self.get_name(self.sorted_ids[lo]) == key:
+            return self.sorted_ids[lo]
+        return None
+
+    @staticmethod
+    def get_codes(relations):
+        return {RELATION_CODES[relation] for relation in relations}
+
+    # Breadth-first walk; returns {node: (previous node, relation code, depth)} for every node reached
+    @staticmethod
+    def walk(csr, start, codes, target=None):
+        offsets, targets, relations = csr
+        reached = {start: (None, None, 0)}
+        queue = deque([start])
+        while len(queue):
+            node = queue.popleft()
+            depth = reached[node][2] + 1
+            for i in range(offsets[node], offsets[node + 1]):
+                nxt = targets[i]
+                if relations[i] in codes and nxt not in reached:
+                    reached[nxt] = (node, relations[i], depth)
+                    if nxt == target:
+                        return reached
+                    queue.append(nxt)
+        return reached
+
+    def describe(self, reached, start):
+        return [(depth, RELATIONS[rel]) + self.node_to_pair(node) for node, (_, rel, depth) in reached.items()
+                if node != start]
+
+    # Every source the word derives from, nearest first, as (depth, relation, lang, word)
+    def ancestry(self, lang, word, relations=ANCESTRY_RELATIONS):
+        start = self.node_id(lang, word)
+        if start is None:
+            return []
+        return self.describe(self.walk(self.parents, start, self.get_codes(relations)), start)
+
+    # Every word derived from a root, nearest first, as (depth, relation, lang, word)
+    def descendants(self, root_lang, root_word, relations=ANCESTRY_RELATIONS):
+        start = self.node_id(root_lang, root_word)
+        if start is None:
+            return []
+        return self.describe(self.walk(self.children, start, self.get_codes(relations)), start)
+
+    # Shortest chain of sources leading from a word to an ancestor, as [(lang, word, relation to the previous), ...]
+    def shortest_path(self, lang, word, root_lang, root_word, relations=ANCESTRY_RELATIONS):
+        start = self.node_id(lang, word)
+        target = self.node_id(root_lang, root_word)
+        if start is None or target is None:
+            return []
+        reached = self.walk(self.parents, start, self.get_codes(relations), target)
+        if target not in reached:
+            return []
+
+        path = []
+        node = target
+        while node is not None:
+            previous, rel, _ = reached[node]
+            path.append(self.node_to_pair(node) + (RELATIONS[rel] if rel is not None else '',))
+            node = previous
+        return path[::-1]
+
+    # Shortest chain of borrowings and calques leading from a word to a source word
+    def borrowing_path(self, lang, word, root_lang, root_word):
+        return self.shortest_path(lang, word, root_lang, root_word, BORROWING_RELATIONS)
+
+    def save(self, filepath='outputs/EtymologyGraph.pkl'):
+        with open(filepath, 'wb') as f:
+            pickle.dump((self.name_offsets, self.name_buffer, self.sorted_ids, self.parents, self.children), f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, filepath='outputs/EtymologyGraph.pkl'):
+        graph = cls()
+        with open(filepath, 'rb') as f:
+            graph.name_offsets, graph.name_buffer, graph.sorted_ids, graph.parents, graph.children = pickle.load(f)
+        return graph
+
+
+def zeros(typecode, length):
+    return array(typecode, bytes(array(typecode).itemsize * length))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build or query the etymology graph')
+    parser.add_argument('--graph', default='outputs/EtymologyGraph.pkl', help='Path of the saved graph')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help='Build the graph from a dump, or the extracted CSV, and save it')
+    build_parser.add_argument('--dump', help='Path of the dump; chains of sources are only complete when built from it')
+    build_parser.add_argument('--index', help='Index file of a multistream dump, if not next to the dump')
+    build_parser.add_argument('--csv', default='outputs/WiktionaryOutput.csv', help='Path of the extracted CSV file')
+    for command in ('ancestry', 'descendants'):
+        query_parser = subparsers.add_parser(command)
+        query_parser.add_argument('lang')
+        query_parser.add_argument('word')
+    path_parser = subparsers.add_parser('path', help='Shortest borrowing path from a word to a source word')
+    path_parser.add_argument('lang')
+    path_parser.add_argument('word')
+    path_parser.add_argument('root_lang')
+    path_parser.add_argument('root_word')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        etymology_graph = EtymologyGraph()
+        if args.dump is not None:
+            etymology_graph.add_wiktionary_dump(args.dump, args.index)
+        else:
+            etymology_graph.add_wiktionary_csv(args.csv)
+        etymology_graph.finalize()
+        etymology_graph.save(args.graph)
+        print('{} nodes'.format(len(etymology_graph)))
+    else:
+        etymology_graph = EtymologyGraph.load(args.graph)
+        if args.command == 'path':
+            for result in etymology_graph.borrowing_path(args.lang, args.word, args.root_lang, args.root_word):
+                print(','.join(result))
+        else:
+            for result in getattr(etymology_graph, args.command)(args.lang, args.word):
+                print(','.join([str(x) for x in result]))
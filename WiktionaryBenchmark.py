@@ -0,0 +1,391 @@
+from WiktionaryEntry import WiktionaryEntry
+from WiktionaryExtractor import WiktionaryExtractor
+from WiktionaryNormalize import normalize_src_word, normalize_tr
+from WiktionaryScripts import get_script, only_roman_chars
+from WiktionaryTags import WiktionaryTags, cache_fp
+from WiktionaryTemplates import template_cache
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata as ud
+
+BENCHMARK_LANGUAGES = (('English', 'en'), ('Dutch', 'nl'), ('Indonesian', 'id'), ('Latin', 'la'), ('French', 'fr'),
+                       ('German', 'de'), ('Spanish', 'es'), ('Javanese', 'jv'))
+SOURCE_LANGS = ('nl', 'la', 'jv', 'fr', 'en', 'de', 'pt', 'ar', 'sa', 'LL.', 'ML.', 'poz-pro', 'map-pro', 'ine-pro',
+                'gem-pro', 'grc')
+SOURCE_WORDS = ('alas', 'hutan', 'kantor', 'boek', 'liber', 'aqua', '*halas', '*Salas', 'foo bar', 'baz (qux)',
+                '[[kantoor]]', 'ꦲꦭꦱ꧀', '東京', 'Đông', 'a<sub>1</sub>', '-')
+ETYMOLOGY_TEMPLATES = ('bor', 'borrowed', 'learned borrowing', 'der', 'inh', 'calque', 'cog', 'm', 'l', 'noncog')
+TEMPLATE_EXTRAS = ('', '|t=forest, wood', '|tr=alas', '|ts=ala', '|sort=x', '||gloss')
+POS_HEADERS = ('Noun', 'Verb', 'Adjective', 'Adverb')
+BENCHMARKS = ('dump_scan', 'dump_scan_all_namespaces', 'process_line', 'entry_parsing', 'check_list_duplicates',
+              'to_full_string', 'only_roman_chars_legacy', 'only_roman_chars', 'get_script', 'normalization_legacy',
+              'normalization', 'tags_load_text', 'tags_load_cached', 'startup')
+
+
+# Deterministic generator of Wiktionary-like XML: the same parameters and seed always give the same dump. One in five
+# pages is outside the main namespace, as in the real dump: templates (ns 10), which the extractor skips, and
+# reconstructions (ns 118), which it reads. module_lines lines of Lua are added to each template.
+class SyntheticDump(object):
+    def __init__(self, pages=1000, langs_per_page=2, etymologies_per_lang=2, templates_per_section=4,
+                 compound_rate=0.15, nested_rate=0.1, module_lines=0, seed=0):
+        self.pages = pages
+        self.langs_per_page = langs_per_page
+        self.etymologies_per_lang = etymologies_per_lang
+        self.templates_per_section = templates_per_section
+        self.compound_rate = compound_rate  # Share of templates joined to a second one with ' + '
+        self.nested_rate = nested_rate  # Share of templates with a {{l|..}} nested in their transliteration
+        self.module_lines = module_lines
+        self.seed = seed
+
+    def get_params(self):
+        return {'pages': self.pages, 'langs_per_page': self.langs_per_page,
+                'etymologies_per_lang': self.etymologies_per_lang,
+                'templates_per_section': self.templates_per_section, 'compound_rate': self.compound_rate,
+                'nested_rate': self.nested_rate, 'module_lines': self.module_lines, 'seed': self.seed}
+
+    def get_template(self, rng):
+        template = rng.choice(ETYMOLOGY_TEMPLATES)
+        extra = rng.choice(TEMPLATE_EXTRAS)
+        if rng.random() < self.nested_rate:
+            extra = '|tr={{{{l|{}|{}}}}}'.format(rng.choice(SOURCE_LANGS), rng.choice(SOURCE_WORDS))
+        if template in ('cog', 'm', 'l'):
+            return '{{{{{}|{}|{}{}}}}}'.format(template, rng.choice(SOURCE_LANGS), rng.choice(SOURCE_WORDS), extra)
+        return '{{{{{}|en|{}|{}{}}}}}'.format(template, rng.choice(SOURCE_LANGS), rng.choice(SOURCE_WORDS), extra)
+
+    def get_etymology_line(self, rng):
+        parts = []
+        for _ in range(self.templates_per_section):
+            template = self.get_template(rng)
+            if rng.random() < self.compound_rate:
+                template += ' + ' + self.get_template(rng)
+            parts.append('From ' + template)
+        return ', '.join(parts) + '.'
+
+    def iter_page_lines(self, rng, page):
+        if page % 5 == 4:
+            title = rng.choice(('Template:etym{}', 'Reconstruction:Proto-Malayic/w{}')).format(page)
+            ns = 10 if title.startswith('Template:') else 118
+        else:
+            title, ns = 'w{}'.format(page), 0
+        yield '  <page>'
+        yield '    <title>{}</title>'.format(title)
+        yield '    <ns>{}</ns>'.format(ns)
+        yield '    <id>{}</id>'.format(page)
+        yield '    <revision>'
+        yield '      <id>{}</id>'.format(1000000 + page)
+        yield '      <text xml:space="preserve">'
+        if ns == 10:
+            for i in range(self.module_lines):
+                yield 'local data_{} = {{ code = &quot;{}&quot;, scripts = {{&quot;Latn&quot;}} }}'.format(
+                    i, rng.choice(SOURCE_LANGS))
+        for lang, code in rng.sample(BENCHMARK_LANGUAGES, min(self.langs_per_page, len(BENCHMARK_LANGUAGES))):
+            yield '=={}=='.format(lang)
+            for etym in range(self.etymologies_per_lang):
+                yield '===Etymology {}==='.format(etym + 1) if self.etymologies_per_lang > 1 else '===Etymology==='
+                yield self.get_etymology_line(rng)
+                yield '===Pronunciation==='
+                yield '* {{{{a|US}}}} {{{{IPA|{}|/{}/}}}}'.format(code, rng.choice(('ab', 'kan.tor', 'dəf')))
+                yield '===={}===='.format(rng.choice(POS_HEADERS))
+                yield '# definition'
+        yield '</text>'
+        yield '      <sha1>{:x}</sha1>'.format(rng.getrandbits(64))
+        yield '    </revision>'
+        yield '  </page>'
+
+    def iter_lines(self):
+        rng = random.Random(self.seed)
+        yield '<mediawiki>'
+        for page in range(self.pages):
+            yield from self.iter_page_lines(rng, page)
+        yield '</mediawiki>'
+
+    def write(self, filepath):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            for line in self.iter_lines():
+                f.write(line)
+                f.write('\n')
+
+
+def get_peak_rss():
+    try:
+        import resource
+    except ImportError:  # Not available on Windows
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # ru_maxrss is in KB on Linux
+
+
+def get_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        return ''
+
+
+# Times each stage of the extractor on a synthetic dump. Each benchmark is run repeat times and the fastest run is
+# kept; the template cache is cleared before every run so that runs are comparable.
+class WiktionaryBenchmark(object):
+    def __init__(self, dump, repeat=3):
+        self.dump = dump
+        self.repeat = repeat
+        self.lines = list(dump.iter_lines())
+        self.sections = []
+        self.entries = []
+
+    # setup is called before every run and its result passed to func; only func is timed
+    def time_best(self, func, setup=None):
+        best = float('inf')
+        for _ in range(self.repeat):
+            template_cache.clear()
+            args = (setup(),) if setup is not None else ()
+            start = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    # Benchmarks that do not depend on the dump have no pages
+    def get_result(self, seconds, pages=None, rows=None):
+        result = {'seconds': round(seconds, 6)}
+        if pages is not None:
+            result['pages_per_sec'] = round(pages / seconds, 1)
+        if rows is not None:
+            result['rows'] = rows
+            result['rows_per_sec'] = round(rows / seconds, 1)
+        result['peak_rss'] = get_peak_rss()
+        return result
+
+    # Reading the dump file into language sections, skipping pages outside the content namespaces or not
+    def run_dump_scan(self, content_namespaces_only=True):
+        with tempfile.TemporaryDirectory() as directory:
+            dump_fp = os.path.join(directory, 'dump.xml')
+            self.dump.write(dump_fp)
+
+            def scan():
+                scraper = WiktionaryExtractor()
+                scraper.wiktionary_dump_filepath = dump_fp
+                scraper.workers = 1
+                scraper.content_namespaces_only = content_namespaces_only
+                for _ in scraper.iter_sections():
+                    pass
+
+            seconds = self.time_best(scan)
+        return self.get_result(seconds, self.dump.pages)
+
+    def run_dump_scan_all_namespaces(self):
+        return self.run_dump_scan(False)
+
+    # Dump lines to language sections, as read by the extractor
+    def run_process_line(self):
+        def process_lines():
+            scraper = WiktionaryExtractor()
+            scraper.collect_sections = True
+            for line in self.lines:
+                scraper.process_line(line)
+            self.sections = scraper.sections
+
+        seconds = self.time_best(process_lines)
+        return self.get_result(seconds, self.dump.pages)
+
+    def run_entry_parsing(self):
+        def parse_entries():
+            self.entries = [WiktionaryEntry(title, text) for title, text in self.sections]
+
+        seconds = self.time_best(parse_entries)
+        return self.get_result(seconds, self.dump.pages)
+
+    # Merging works on the full lists of the entries, which are built again before every run
+    def run_check_list_duplicates(self):
+        def merge_duplicates(full_lists):
+            for entry, full_list in zip(self.entries, full_lists):
+                entry.check_list_duplicates(full_list)
+
+        rows = sum([len(full_list) for full_list in self.get_full_lists()])
+        seconds = self.time_best(merge_duplicates, self.get_full_lists)
+        return self.get_result(seconds, self.dump.pages, rows)
+
+    def get_full_lists(self):
+        return [entry.to_full_list() for entry in self.entries]
+
+    def run_to_full_string(self):
+        rows = sum([len(entry.to_full_rows()) for entry in self.entries])
+        def to_strings():
+            for entry in self.entries:
+                entry.to_full_string()
+
+        seconds = self.time_best(to_strings)
+        return self.get_result(seconds, self.dump.pages, rows)
+
+    # Template arguments of each section, the strings whose scripts are checked while parsing
+    def get_section_words(self):
+        return [[w for line in text for w in re.findall(r'[^{}|=\s,.]+', line)] for title, text in self.sections]
+
+    # The romanization check before WiktionaryScripts: a Unicode name lookup per character, cached per entry
+    def run_only_roman_chars_legacy(self):
+        section_words = self.get_section_words()
+
+        def check():
+            for words in section_words:
+                latin_letters = {}
+
+                def is_latin(uchr):
+                    try:
+                        return latin_letters[uchr]
+                    except KeyError:
+                        return latin_letters.setdefault(uchr, 'LATIN' in ud.name(uchr))
+
+                for w in words:
+                    all(is_latin(uchr) for uchr in w if uchr.isalpha())
+
+        seconds = self.time_best(check)
+        return self.get_result(seconds, self.dump.pages, sum([len(words) for words in section_words]))
+
+    def run_only_roman_chars(self):
+        section_words = self.get_section_words()
+
+        def check():
+            for words in section_words:
+                for w in words:
+                    only_roman_chars(w)
+
+        seconds = self.time_best(check)
+        return self.get_result(seconds, self.dump.pages, sum([len(words) for words in section_words]))
+
+    def run_get_script(self):
+        section_words = self.get_section_words()
+
+        def classify():
+            for words in section_words:
+                for w in words:
+                    get_script(w)
+
+        seconds = self.time_best(classify)
+        return self.get_result(seconds, self.dump.pages, sum([len(words) for words in section_words]))
+
+    # Template arguments of each line, as normalized into root words and romanizations
+    def get_template_args(self):
+        return [arg for title, text in self.sections for line in text for arg in re.findall(r'[^{}|=]+', line)]
+
+    # Root word and romanization normalization before WiktionaryNormalize: a chain of uncompiled re.sub calls
+    def run_normalization_legacy(self):
+        args = self.get_template_args()
+
+        def normalize():
+            for arg in args:
+                src_word = re.sub(r'\([^)]*\)', '', arg)
+                src_word = re.sub(r'\[', '', src_word)
+                src_word = re.sub(r']', '', src_word)
+                splits = re.search(', ', src_word)
+                if splits is None:
+                    re.sub(r'\s+', '+', src_word.strip())
+
+                processed = re.sub(r'[\[\]]', '', arg)
+                processed = re.sub(r'<sub>\w*</sub>', '', processed)
+                processed = re.sub(r'<sup>\w*</sup>\.?', '', processed)
+                processed = re.sub(r'&lt;sub&gt;\w*&lt;/sub&gt;', '', processed)
+                re.sub(r'&lt;sup&gt;\w*&lt;/sup&gt;\.?', '', processed)
+
+        seconds = self.time_best(normalize)
+        return self.get_result(seconds, self.dump.pages, len(args))
+
+    def run_normalization(self):
+        args = self.get_template_args()
+
+        def normalize():
+            for arg in args:
+                normalize_src_word(arg)
+                normalize_tr(arg)
+
+        seconds = self.time_best(normalize)
+        return self.get_result(seconds, self.dump.pages, len(args))
+
+    # Parsing the ISO code and part of speech files, as every process did before the tag cache
+    def run_tags_load_text(self):
+        return self.get_result(self.time_best(lambda: WiktionaryTags(None)))
+
+    def run_tags_load_cached(self):
+        WiktionaryTags(None).save_cache(cache_fp)
+        return self.get_result(self.time_best(WiktionaryTags))
+
+    # A new interpreter importing the extractor and loading the tags, as every run and every spawned worker does
+    def run_startup(self):
+        command = [sys.executable, '-c', 'import WiktionaryExtractor; WiktionaryExtractor.get_tags()']
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+        return self.get_result(self.time_best(lambda: subprocess.run(command, env=env, check=True)))
+
+    # Benchmarks depend on the ones before them (sections, then entries), so they always run in order
+    def run(self):
+        return {name: getattr(self, 'run_' + name)() for name in BENCHMARKS}
+
+
+def run_benchmarks(dump, repeat=3):
+    return {'commit': get_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'dump': dump.get_params(),
+            'repeat': repeat,
+            'benchmarks': WiktionaryBenchmark(dump, repeat).run()}
+
+
+def print_results(results, baseline=None):
+    for name, result in results['benchmarks'].items():
+        if 'pages_per_sec' in result:
+            line = '{:<24}{:>10.3f} s{:>12.0f} pages/s'.format(name, result['seconds'], result['pages_per_sec'])
+        else:
+            line = '{:<24}{:>10.3f} ms'.format(name, result['seconds'] * 1000)
+        if 'rows_per_sec' in result:
+            line += '{:>12.0f} rows/s'.format(result['rows_per_sec'])
+        if baseline is not None and name in baseline['benchmarks']:
+            line += '   {:.2f}x vs {}'.format(baseline['benchmarks'][name]['seconds'] / result['seconds'],
+                                             baseline['commit'] or 'baseline')
+        print(line)
+    if results['benchmarks'][BENCHMARKS[-1]]['peak_rss'] is not None:
+        print('Peak RSS: {:.1f} MB'.format(results['benchmarks'][BENCHMARKS[-1]]['peak_rss'] / 2 ** 20))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate synthetic Wiktionary dumps and benchmark the extractor')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    generate_parser = subparsers.add_parser('generate', help='Write a synthetic dump')
+    generate_parser.add_argument('output', help='Path of the XML file to write')
+    run_parser = subparsers.add_parser('run', help='Benchmark the extractor on a synthetic dump')
+    run_parser.add_argument('--repeat', type=int, default=3, help='Runs per benchmark; the fastest is reported')
+    run_parser.add_argument('--output', help='Path of the JSON results (default outputs/benchmarks/<commit>.json)')
+    run_parser.add_argument('--compare', help='JSON results of an earlier run to compare against')
+    for subparser in (generate_parser, run_parser):
+        subparser.add_argument('--pages', type=int, default=1000)
+        subparser.add_argument('--langs-per-page', type=int, default=2)
+        subparser.add_argument('--etymologies-per-lang', type=int, default=2)
+        subparser.add_argument('--templates-per-section', type=int, default=4)
+        subparser.add_argument('--compound-rate', type=float, default=0.15)
+        subparser.add_argument('--nested-rate', type=float, default=0.1)
+        subparser.add_argument('--module-lines', type=int, default=0, help='Lines of Lua in each non-content page')
+        subparser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    synthetic_dump = SyntheticDump(args.pages, args.langs_per_page, args.etymologies_per_lang,
+                                   args.templates_per_section, args.compound_rate, args.nested_rate,
+                                   args.module_lines, args.seed)
+    if args.command == 'generate':
+        synthetic_dump.write(args.output)
+    else:
+        benchmark_results = run_benchmarks(synthetic_dump, args.repeat)
+        baseline_results = None
+        if args.compare is not None:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline_results = json.load(f)
+        print_results(benchmark_results, baseline_results)
+
+        results_fp = args.output
+        if results_fp is None:
+            os.makedirs('outputs/benchmarks', exist_ok=True)
+            results_fp = 'outputs/benchmarks/{}.json'.format(benchmark_results['commit'] or int(time.time()))
+        with open(results_fp, 'w', encoding='utf-8') as f:
+            json.dump(benchmark_results, f, indent=2)
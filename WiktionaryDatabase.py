@@ -0,0 +1,72 @@
+import sqlite3
+from WiktionaryEntry import OUTPUT_COLUMNS
+
+# Lookup indexes built once loading is done: by word, by source word and by relation
+WIKTIONARY_INDEXES = (('word', 'lang'), ('root_lang', 'root_word'), ('relation',))
+INTEGER_COLUMNS = {'dist'}
+
+
+# Output sink that loads rows into an SQLite table. Rows are inserted with executemany in batches, all inside one
+# transaction that is committed every commit_size rows. Indexes are only built on close, after the bulk load. An
+# existing table of the same name is dropped with its indexes, so a load always starts from an empty, unindexed table;
+# other tables of the database are kept.
+class WiktionaryDatabase(object):
+    def __init__(self, filepath='outputs/Wiktionary.db', table='wiktionary', columns=OUTPUT_COLUMNS,
+                 indexes=WIKTIONARY_INDEXES, batch_size=10000, commit_size=1000000):
+        self.filepath = filepath
+        self.table = table
+        self.columns = columns
+        self.indexes = indexes
+        self.batch_size = batch_size
+        self.commit_size = commit_size
+        self.rows = []
+        self.uncommitted = 0
+
+        self.connection = sqlite3.connect(filepath)
+        self.connection.execute('PRAGMA synchronous = OFF')
+        self.connection.execute('PRAGMA journal_mode = MEMORY')
+        column_defs = ', '.join(['{} {}'.format(c, 'INTEGER' if c in INTEGER_COLUMNS else 'TEXT') for c in columns])
+        self.connection.execute('DROP TABLE IF EXISTS {}'.format(table))
+        self.connection.execute('CREATE TABLE {} ({})'.format(table, column_defs))
+        self.insert_sql = 'INSERT INTO {} VALUES ({})'.format(table, ', '.join(['?'] * len(columns)))
+
+    def write_rows(self, rows):
+        self.rows.extend(rows)
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    # Lines of comma-separated values, as written to the output CSV
+    def write(self, output_str):
+        if len(output_str):
+            self.write_rows([line.split(',') for line in output_str.split('\n')])
+
+    def flush(self):
+        if len(self.rows):
+            self.connection.executemany(self.insert_sql, self.rows)
+            self.uncommitted += len(self.rows)
+            self.rows = []
+        if self.uncommitted >= self.commit_size:
+            self.connection.commit()
+            self.uncommitted = 0
+
+    def create_indexes(self):
+        for columns in self.indexes:
+            name = 'idx_{}_{}'.format(self.table, '_'.join(columns))
+            self.connection.execute('CREATE INDEX {} ON {} ({})'.format(name, self.table, ', '.join(columns)))
+        self.connection.execute('ANALYZE')
+
+    def close(self):
+        if self.connection is None:
+            return
+        self.flush()
+        self.connection.commit()
+        self.create_indexes()
+        self.connection.commit()
+        self.connection.close()
+        self.connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
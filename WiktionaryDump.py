@@ -0,0 +1,264 @@
+import bz2
+import gzip
+import os
+import threading
+import time
+from collections import deque
+from itertools import chain
+from queue import Empty, Full, Queue
+
+CONTENT_NAMESPACES = (b'0<', b'118<')  # <ns> values of the main and Reconstruction namespaces
+
+
+# Streams the lines of a Wiktionary XML dump. Plain XML, .bz2 and .gz dumps are decompressed on the fly; a
+# pages-articles-multistream.xml.bz2 dump with its companion index is split into its independent bz2 streams, which are
+# decompressed in parallel worker processes and yielded back in file order.
+#
+# The dump is read in binary blocks. With content_namespaces_only, pages outside the main and Reconstruction
+# namespaces (templates, modules, appendices...) are recognized by their <ns> element and skipped without being decoded
+# or split into lines; the rest is decoded a block at a time. With read_ahead, blocks are read, decompressed and split
+# into lines by a background thread while the caller parses the lines of earlier blocks. With page_offsets, the
+# position of every page that is read is recorded so that a later run can seek() straight to it.
+class WiktionaryDump(object):
+    def __init__(self, filepath, index_filepath=None, workers=None):
+        self.filepath = filepath
+        self.index_filepath = index_filepath
+        if self.index_filepath is None:
+            self.index_filepath = self.find_index(filepath)
+        self.workers = workers if workers is not None else os.cpu_count()
+        self.streams_per_chunk = 100  # Each stream holds 100 pages in the official multistream dumps
+        self.block_size = 1 << 20
+        self.read_ahead = 0  # Blocks of lines the background thread may have ready; 0 reads in the calling thread
+        self.read_wait = 0.0  # Seconds the caller spent waiting for the background thread
+        self.raw = None
+        self.offset = 0  # Bytes of the dump file read so far, when there is no open file to ask
+        self.content_namespaces_only = False
+        self.pages = 0
+        self.skipped_pages = 0
+        self.page_offsets = None  # deque of (stream offset, offset) of the pages read, see seek()
+        self.start_stream = 0
+        self.start_offset = 0
+
+    # The official dumps name the index enwiktionary-<date>-pages-articles-multistream-index.txt.bz2
+    @staticmethod
+    def find_index(filepath):
+        if not filepath.endswith('multistream.xml.bz2'):
+            return None
+        index_fp = filepath[:-len('.xml.bz2')] + '-index.txt.bz2'
+        if os.path.exists(index_fp):
+            return index_fp
+        return None
+
+    def open(self):
+        raw = self.raw = open(self.filepath, 'rb')
+        raw.seek(self.start_stream)
+        if self.filepath.endswith('.bz2'):
+            return bz2.BZ2File(raw)
+        elif self.filepath.endswith('.gz'):
+            return gzip.GzipFile(fileobj=raw)
+        return raw
+
+    # Start reading at a position from page_offsets: the offset of a bz2 stream in the file (0 unless the dump is
+    # multistream) and an offset in the data decompressed from there. Dumps compressed as a single stream are
+    # decompressed up to the offset, which is still much faster than parsing up to it.
+    def seek(self, stream_offset, offset):
+        self.start_stream = stream_offset
+        self.start_offset = offset
+
+    # Blocks of the dump as (offset of their bz2 stream, offset of the block in the data decompressed from it, bytes)
+    def iter_blocks(self):
+        if self.index_filepath is not None and self.workers > 1:
+            yield from self.iter_multistream()
+        else:
+            with self.open() as f:
+                if self.start_offset:
+                    f.seek(self.start_offset)
+                position = self.start_offset
+                block = f.read(self.block_size)
+                while len(block):
+                    yield self.start_stream, position, block
+                    position += len(block)
+                    block = f.read(self.block_size)
+            self.offset = self.get_size()
+
+    # Lines are chained from lists of lines, one per block, so that no Python code runs per line
+    def __iter__(self):
+        if self.read_ahead > 0:
+            return chain.from_iterable(self.iter_read_ahead())
+        return chain.from_iterable(self.iter_line_lists())
+
+    # The lists of iter_line_lists, produced by a background thread up to read_ahead blocks ahead. File reads and the
+    # bz2, gzip and zlib decompressors release the GIL, so they overlap with parsing in the calling thread. Errors of
+    # the thread are raised in the caller; if the caller stops early, the thread stops and the dump is closed.
+    def iter_read_ahead(self):
+        queue = Queue(self.read_ahead)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    queue.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def read():
+            line_lists = self.iter_line_lists()
+            try:
+                for lines in line_lists:
+                    if not put(lines):
+                        return
+                put(done)
+            except BaseException as e:
+                put(e)
+            finally:
+                line_lists.close()
+
+        thread = threading.Thread(target=read, name='WiktionaryDump read-ahead', daemon=True)
+        thread.start()
+        try:
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except Empty:
+                    start = time.perf_counter()
+                    item = queue.get()
+                    self.read_wait += time.perf_counter() - start
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            thread.join()
+
+    # Lines are only split on '\n', which never occurs inside a UTF-8 sequence, so blocks of whole lines can be decoded
+    # on their own
+    def iter_line_lists(self):
+        rest = b''
+        stream, position = self.start_stream, self.start_offset  # Position of rest
+        skipping = False
+        for stream, position, block in self.iter_blocks():
+            position -= len(rest)  # Streams end on page boundaries, so rest is always from the same stream
+            data = rest + block
+            end = data.rfind(b'\n') + 1
+            rest = data[end:]
+            lines, skipping, carry = self.scan_pages(data[:end], skipping, stream, position)
+            rest = carry + rest
+            position += end - len(carry)
+            yield lines
+        lines, _, carry = self.scan_pages(rest, skipping, stream, position)
+        yield lines
+        yield self.split_lines(carry.decode('utf-8'))
+
+    # Lines of the kept pages in a block of whole lines. Returns them with whether the block ends inside a skipped page,
+    # and the lines of a page that starts in the block but whose <ns> is not in it yet. Runs of kept pages are decoded
+    # together. Wikitext escapes '<', so '<page>', '<ns>' and '</page>' can only appear in the XML markup. stream and
+    # position are where data starts, for page_offsets.
+    def scan_pages(self, data, skipping, stream=0, position=0):
+        lines = []
+        kept = 0  # Start of the run of kept lines
+        pos = 0
+        while pos < len(data):
+            if skipping:
+                end = data.find(b'</page>', pos)
+                if end < 0:
+                    return lines, True, b''
+                pos = kept = data.find(b'\n', end) + 1 or len(data)
+                skipping = False
+                continue
+
+            start = data.find(b'<page>', pos)
+            if start < 0:
+                break
+            ns = data.find(b'<ns>', start)
+            if ns < 0:
+                line_start = data.rfind(b'\n', 0, start) + 1
+                lines.extend(self.split_lines(data[kept:line_start].decode('utf-8')))
+                return lines, False, data[line_start:]
+
+            self.pages += 1
+            pos = data.find(b'\n', ns) + 1 or len(data)
+            if self.content_namespaces_only and not data.startswith(CONTENT_NAMESPACES, ns + 4):
+                self.skipped_pages += 1
+                lines.extend(self.split_lines(data[kept:data.rfind(b'\n', 0, start) + 1].decode('utf-8')))
+                skipping = True
+            elif self.page_offsets is not None:
+                self.page_offsets.append((stream, position + data.rfind(b'\n', 0, start) + 1))
+        if not skipping:
+            lines.extend(self.split_lines(data[kept:].decode('utf-8')))
+        return lines, skipping, b''
+
+    def get_size(self):
+        return os.path.getsize(self.filepath)
+
+    # Byte offset in the dump file of the lines read so far. Decompressors read ahead, so this runs a block or a chunk
+    # ahead of the last line yielded; it is meant for progress reporting.
+    def tell(self):
+        if self.raw is not None and not self.raw.closed:
+            return self.raw.tell()
+        return self.offset
+
+    # Byte offsets of every bz2 stream, read from the "offset:page_id:title" lines of the index
+    def get_stream_offsets(self):
+        offsets = [0]  # The first stream holds the <siteinfo> header and is not listed in the index
+        opener = bz2.open if self.index_filepath.endswith('.bz2') else open
+        with opener(self.index_filepath, 'rt', encoding='utf-8') as f:
+            for line in f:
+                offset = int(line[:line.index(':')])
+                if offset != offsets[-1]:
+                    offsets.append(offset)
+        offsets.append(os.path.getsize(self.filepath))
+        return offsets
+
+    def get_chunks(self):
+        offsets = [offset for offset in self.get_stream_offsets() if offset >= self.start_stream]
+        for i in range(0, len(offsets) - 1, self.streams_per_chunk):
+            yield offsets[i], offsets[min(i + self.streams_per_chunk, len(offsets) - 1)]
+
+    # Decompressed chunks, in file order, as blocks for iter_blocks. Streams end on page boundaries, so a chunk never
+    # splits a line.
+    def iter_multistream(self):
+        skip = self.start_offset
+        for start, data in self.iter_chunks():
+            if skip >= len(data):
+                skip -= len(data)
+                continue
+            yield start, skip, data[skip:]
+            skip = 0
+
+    def iter_chunks(self):
+        import multiprocessing  # Only multistream dumps read with workers need it
+        max_pending = 2 * self.workers
+        pending = deque()
+        with multiprocessing.Pool(self.workers) as pool:
+            for start, end in self.get_chunks():
+                pending.append((start, end, pool.apply_async(decompress_chunk, (self.filepath, start, end))))
+                while len(pending) >= max_pending:
+                    yield self.collect_chunk(*pending.popleft())
+            while len(pending):
+                yield self.collect_chunk(*pending.popleft())
+
+    def collect_chunk(self, start, end, result):
+        data = result.get()
+        self.offset = end
+        return start, data
+
+    # Only '\n' ends a line, as in file iteration
+    @staticmethod
+    def split_lines(text):
+        lines = text.split('\n')
+        if not len(lines[-1]):
+            lines.pop()
+        return lines
+
+
+# Worker process entry point: decompress the bz2 streams stored between two byte offsets of a multistream dump
+def decompress_chunk(filepath, start, end):
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    return bz2.decompress(data)
@@ -1,8 +1,14 @@
-import copy
-import re
-import unicodedata as ud
+from collections import defaultdict, deque
 from enum import Enum
-from WiktionaryTags import WiktionaryTags
+from WiktionaryNormalize import normalize_roman, normalize_src_word, normalize_tr, normalize_word, strip_brackets_parens
+from WiktionaryScripts import get_script, only_roman_chars
+from WiktionaryTags import get_tags
+from WiktionaryTemplates import parse_templates_cached
+
+
+# Columns of the output rows, see WiktionaryEntry.list_to_row
+OUTPUT_COLUMNS = ('word', 'lang', 'pos', 'ipa', 'root_lang', 'nonstandard_root_code', 'root_word',
+                  'root_script', 'root_roman', 'root_ipa', 'relation', 'dist', 'citation')
 
 
 # State: Is the parser reading an etymology or a pronunciation entry? 0 if no, 1 if etymology, 2 if pronunciation
@@ -12,13 +18,44 @@ class State(Enum):
     PRONOUNCE = 2
 
 
+# One etymological link of an entry: the root word, its language and how the entry derives from it. pos is shared with
+# the entry until its next part of speech header.
+class EtymologyLink(object):
+    __slots__ = ('pos', 'ipa', 'root_lang', 'nonstandard_root_code', 'root_word', 'root_roman', 'root_ipa',
+                 'derivation', 'etym_number')
+
+    def __init__(self, pos, ipa, root_lang, nonstandard_root_code, root_word, root_roman, root_ipa, derivation,
+                 etym_number):
+        self.pos = pos
+        self.ipa = ipa
+        self.root_lang = root_lang
+        self.nonstandard_root_code = nonstandard_root_code
+        self.root_word = root_word
+        self.root_roman = root_roman
+        self.root_ipa = root_ipa
+        self.derivation = derivation
+        self.etym_number = etym_number
+
+    def to_list(self, word, iso_code, dist):
+        output = []
+        if not len(self.root_word):  # If only a transcription or romanization is available
+            output.append([word, iso_code, self.pos, self.ipa, self.root_lang, self.nonstandard_root_code, '',
+                           self.root_roman, self.root_ipa, self.derivation, dist, self.etym_number])
+
+        for root_word in self.root_word:
+            output.append([word, iso_code, self.pos, self.ipa, self.root_lang, self.nonstandard_root_code, root_word,
+                           self.root_roman, self.root_ipa, self.derivation, dist, self.etym_number])
+
+        return output
+
+
 # Stores a single entry for the etymology dictionary
 class WiktionaryEntry(object):
     __slots__ = ('word', 'raw_text', 'iso_code', 'pos', 'ipa', 'root_lang', 'nonstandard_root_code', 'root_word',
-                 'root_roman', 'root_ipa', 'derivation', 'etym_number', 'universal_pronunciation', 'other_entries',
-                 'headers', 'TAGS', 'latin_letters')
+                 'root_roman', 'root_ipa', 'derivation', 'etym_number', 'universal_pronunciation', 'links',
+                 'headers', 'TAGS', 'filter')
 
-    def __init__(self, word, raw_text):
+    def __init__(self, word, raw_text, tags=None, entry_filter=None):
         self.word = self.process_word(word)
         self.raw_text = raw_text
         self.iso_code = ''
@@ -33,12 +70,12 @@ class WiktionaryEntry(object):
         self.etym_number = 0
         self.universal_pronunciation = False
 
-        self.other_entries = []  # Stores other etymologies for the same entry
+        self.links = []  # Links saved before the one currently being parsed into the fields above
 
         self.headers = []  # To help with debugging
 
-        self.TAGS = WiktionaryTags()
-        self.latin_letters = {}  # To ensure that romanizations are in Latin letters
+        self.TAGS = tags if tags is not None else get_tags()  # Shared registry, not copied per entry
+        self.filter = entry_filter  # WiktionaryFilter limiting the relations that are parsed and output
 
         self.parse()
 
@@ -55,123 +92,17 @@ class WiktionaryEntry(object):
         self.derivation = ''
 
     # Denote reconstructions with *
-    @staticmethod
-    def process_word(word):
-        processed = re.sub('^Reconstruction:[\w ]+/', '*', word)
-        return processed
+    process_word = staticmethod(normalize_word)
 
     def process_src_word_var(self, word):
-        if type(word) is list:
+        if type(word) is tuple:
             word = self.combine_last_elements(word)
         return word
 
+    # Templates of a line as nested (key, value) tuples, see WiktionaryTemplates. Results are cached and shared.
     @staticmethod
-    def split_key(line):
-        for i, char in enumerate(line):
-            if char == '=':
-                return [line[:i], line[i+1:]]
-            elif not char.isalpha():
-                break
-        return ['', line]
-
-    @staticmethod
-    def separate_pipes(line):
-        sections = []
-
-        start_idx = 0
-        depth = 0
-        i = 0
-        while i + 1 < len(line):
-            char = line[i]
-            next_char = line[i+1]
-            if char == '{' and next_char == '{':
-                depth += 1
-                i += 1
-            elif char == '}' and next_char == '}':
-                depth -= 1
-                i += 1
-            elif char == '|' and depth == 0:
-                sections.append(line[start_idx:i])
-                start_idx = i + 1
-
-            i += 1
-
-        sections.append(line[start_idx:])
-        return sections
-
-    @staticmethod
-    def get_curly_braces(line):
-        sections = []
-
-        compound_flag = False
-        paren_flag = False
-        start_idx = None
-        depth = 0
-        i = 0
-        while i + 1 < len(line):
-            char = line[i]
-            next_char = line[i+1]
-            if char == '(':
-                paren_flag = True
-            elif paren_flag:
-                if char == ')':
-                    paren_flag = False
-            elif char == '{' and next_char == '{':
-                if depth == 0:
-                    start_idx = i + 2
-                depth += 1
-                i += 1
-            elif char == '}' and next_char == '}':
-                depth -= 1
-                i += 1
-                if depth == 0:
-                    if compound_flag:
-                        if len(sections):
-                            if type(sections[-1]) is not list:
-                                sections[-1] = [sections[-1]]
-                            sections[-1].append(line[start_idx:i-1])
-                        compound_flag = False
-                    else:
-                        sections.append(line[start_idx:i-1])
-            elif char == '+' and depth == 0:  # Compound
-                compound_flag = True
-            i += 1
-
-        return sections
-
-    def get_base_list(self, l):
-        if len(l) == 1 and type(l[0]) is list:
-            return self.get_base_list(l[0])
-        return l
-
-    def process_sub_braces(self, e):
-        sub = []
-        children = self.separate_pipes(e)
-        for i, c in enumerate(children):
-            key, val = self.split_key(c)
-            e_child = self.get_curly_braces(val)
-            if len(e_child):
-                dub_sub = []
-                for e_c in self.get_base_list(e_child):
-                    dub_sub.append(self.separate_pipes(e_c))
-                sub.append([key, dub_sub])
-            else:
-                sub.append([key, val])
-        return sub
-
-    def get_all_braces(self, line):
-        output = []
-        entries = self.get_curly_braces(line)
-        for e in entries:
-            if type(e) is list:
-                sub = []
-                for cmp in e:
-                    compound_sub = self.process_sub_braces(cmp)
-                    sub.append(compound_sub)
-            else:
-                sub = self.process_sub_braces(e)
-            output.append(sub)
-        return output
+    def get_all_braces(line):
+        return parse_templates_cached(line)
 
     @staticmethod
     def is_header(line):
@@ -192,14 +123,13 @@ class WiktionaryEntry(object):
             return True
         return False
 
-    def create_other_entry(self, reinit_pos=True, increment_etym=False):
-        new_entry = copy.copy(self)
+    def get_current_link(self):
+        return EtymologyLink(self.pos, self.ipa, self.root_lang, self.nonstandard_root_code, self.root_word,
+                             self.root_roman, self.root_ipa, self.derivation, self.etym_number)
 
-        # Only have "self" contain list of other entries (prevent useless deeper recursion)
-        self.other_entries = new_entry.other_entries
-        new_entry.other_entries = []
-
-        self.other_entries.append(new_entry)
+    # Save the link parsed so far and start a new one
+    def create_link(self, reinit_pos=True, increment_etym=False):
+        self.links.append(self.get_current_link())
         self.reinitialize(reinit_pos)
         if increment_etym:
             self.etym_number += 1
@@ -217,7 +147,7 @@ class WiktionaryEntry(object):
         elif header_depth == 3:
             if header[:9] == 'Etymology':
                 if len(header) > 9 and header != 'Etymology 1':  # Create another Entry if multiple etymologies given
-                    self.create_other_entry(increment_etym=True)
+                    self.create_link(increment_etym=True)
                 return State.ETYM
 
         if header in self.TAGS.POS:
@@ -248,27 +178,15 @@ class WiktionaryEntry(object):
                 self.root_word.append(word)
                 result = True
         if len(rom):
-            self.root_roman = re.sub(' ', '+', rom)
+            self.root_roman = normalize_roman(rom)
             result = True
         if len(ipa):
             self.root_ipa = ipa
             result = True
         return result
 
-    @staticmethod
-    def process_src_word(src_word):
-        src_word = re.sub('\([^)]*\)', '', src_word)
-        src_word = re.sub('\[', '', src_word)
-        src_word = re.sub(']', '', src_word)
-
-        # If there is a list of words, split the words into a list
-        splits = re.search(', ', src_word)
-        if splits is not None:
-            words = [src_word[:splits.start()], src_word[splits.end():]]
-        else:
-            words = [re.sub('\s+', '+', src_word.strip())]
-
-        return words
+    # If there is a list of words, split the words into a list, see WiktionaryNormalize
+    process_src_word = staticmethod(normalize_src_word)
 
     def set_nonstandard_root(self, lang_id):
         self.nonstandard_root_code = lang_id
@@ -277,7 +195,7 @@ class WiktionaryEntry(object):
 
     def parse_etymology(self, etym):
         # Check if compound
-        if type(etym[0][0]) is list:
+        if type(etym[0][0]) is tuple:
             cmp_der, cmp_src_lang_id, cmp_src_word, cmp_rom, cmp_ipa = [], [], [], [], []
             for cmp in etym:
                 der, src_lang_id, src_word, rom, ipa = self.get_etym_vars(cmp)
@@ -334,29 +252,14 @@ class WiktionaryEntry(object):
             combined.append(e[-1])
         return '+'.join(combined)
 
-    def is_latin(self, uchr):
-        try:
-            return self.latin_letters[uchr]
-        except KeyError:
-            return self.latin_letters.setdefault(uchr, 'LATIN' in ud.name(uchr))
-
-    def only_roman_chars(self, unistr):
-        return all(self.is_latin(uchr) for uchr in unistr if uchr.isalpha())  # isalpha suggested by John Machin
-
     def process_tr(self, string):
-        if type(string) is list:
+        if type(string) is tuple:
             string = self.combine_last_elements(string)
 
-        if not self.only_roman_chars(string):
+        if not only_roman_chars(string):  # Romanizations must be in Latin letters
             return ''
 
-        processed = re.sub('[\[\]]', '', string)
-        processed = re.sub(r'<sub>\w*</sub>', '', processed)
-        processed = re.sub(r'<sup>\w*</sup>\.?', '', processed)
-        processed = re.sub(r'&lt;sub&gt;\w*&lt;/sub&gt;', '', processed)
-        processed = re.sub(r'&lt;sup&gt;\w*&lt;/sup&gt;\.?', '', processed)
-
-        return processed
+        return normalize_tr(string)
 
     def get_etym_vars(self, etym):
         der = src_lang_id = src_word = romanized = ipa = ''
@@ -386,10 +289,15 @@ class WiktionaryEntry(object):
         return der, src_lang_id, src_word, romanized, ipa
 
     def process_etymologies(self, line):
-        etyms = self.get_all_braces(line)
+        if self.filter is not None:
+            if not self.filter.keep_line(line):
+                return
+            etyms = [etym for etym in self.get_all_braces(line) if self.filter.keep_template(etym)]
+        else:
+            etyms = self.get_all_braces(line)
 
         for i, etym in enumerate(etyms):
-            self.create_other_entry(reinit_pos=False)
+            self.create_link(reinit_pos=False)
             self.parse_etymology(etym)
 
             # Some Middle Chinese words are split across two etymology tags
@@ -397,11 +305,11 @@ class WiktionaryEntry(object):
                 if i + 1 < len(etyms):
                     next_etym = etyms[i+1]
                     if len(next_etym) >= 2 and next_etym[0][1] == 'ltc-l':
-                        word = re.sub('[\[\]\(\)]', '', next_etym[1][1])
+                        word = strip_brackets_parens(next_etym[1][1])
                         self.root_word.append(word)
 
     def is_compound_pair(self, pair):
-        if len(pair) > 1 and type(pair[1]) is list:
+        if len(pair) > 1 and type(pair[1]) is tuple:
             return True
         return False
 
@@ -453,9 +361,9 @@ class WiktionaryEntry(object):
             else:
                 self.parse_pronunciation(pron, accent)
 
-        for entry in self.other_entries:
-            if entry.etym_number == self.etym_number:
-                entry.ipa = self.ipa
+        for link in self.links:
+            if link.etym_number == self.etym_number:
+                link.ipa = self.ipa
 
     def parse(self):
         state = State.OTHER
@@ -469,44 +377,24 @@ class WiktionaryEntry(object):
             elif state is State.PRONOUNCE:
                 self.process_pronunciation(line)
 
-    def to_list(self, dist):
-        output = []
-        if not len(self.root_word):  # If only a transcription or romanization is available
-            output.append([self.word, self.iso_code, self.pos, self.ipa, self.root_lang, self.nonstandard_root_code, '',
-                    self.root_roman, self.root_ipa, self.derivation, dist, self.etym_number])
-
-        for word in self.root_word:
-            output.append([self.word, self.iso_code, self.pos, self.ipa, self.root_lang, self.nonstandard_root_code, word,
-                           self.root_roman, self.root_ipa, self.derivation, dist, self.etym_number])
-
-        return output
-
     def to_full_list(self):
         full_list = []
 
         dist = 0
         prev_etym_number = self.etym_number
 
-        for entry in self.other_entries:
-            if entry.etym_number != prev_etym_number:
+        for link in self.links + [self.get_current_link()]:
+            if link.etym_number != prev_etym_number:
                 dist = 0
-                prev_etym_number = entry.etym_number
+                prev_etym_number = link.etym_number
 
-            if len(entry.root_lang) or len(entry.nonstandard_root_code):
-                if entry.derivation in ['cognate', 'cog', 'm']:  # Don't set a dist for words that aren't ancestors
-                    if len(entry.root_word) or len(entry.root_roman) or len(entry.root_ipa):
-                        full_list.extend(entry.to_list(dist=0))
+            if len(link.root_lang) or len(link.nonstandard_root_code):
+                if link.derivation in ['cognate', 'cog', 'm']:  # Don't set a dist for words that aren't ancestors
+                    if len(link.root_word) or len(link.root_roman) or len(link.root_ipa):
+                        full_list.extend(link.to_list(self.word, self.iso_code, 0))
                 else:
                     dist += 1
-                    full_list.extend(entry.to_list(dist))
-
-        if len(self.root_lang) or len(self.nonstandard_root_code):
-            if self.derivation in ['cognate', 'cog', 'm']:  # Don't set a dist for words that aren't ancestors
-                if len(self.root_word) or len(self.root_roman) or len(self.root_ipa):
-                    full_list.extend(self.to_list(0))
-            else:
-                dist += 1
-                full_list.extend(self.to_list(dist))
+                    full_list.extend(link.to_list(self.word, self.iso_code, dist))
 
         return full_list
 
@@ -596,42 +484,96 @@ class WiktionaryEntry(object):
     def are_duplicates(self, l1, l2):
         return self.lang_duplicates(l1, l2) and self.word_duplicates(l1, l2)
 
+    # Repeat merging passes until no duplicates are left (a merged row can become a duplicate of another row)
     def check_list_duplicates(self, full_list):
         while True:
-            temp_list = []
-            merged_idxs = []
-            for i, l1 in enumerate(full_list):
-                for j, l2 in enumerate(full_list):
-                    if i >= j or i in merged_idxs or j in merged_idxs:
-                        continue
-                    if self.are_duplicates(l1, l2):
-                        temp_list.append(self.combine_duplicates(l1, l2))
-                        merged_idxs.append(i)
-                        merged_idxs.append(j)
-
-            for k, l in enumerate(full_list):
-                if k not in merged_idxs:
-                    temp_list.append(l)
-
+            temp_list = self.merge_duplicates_pass(full_list)
             if len(temp_list) == len(full_list):
                 break
             full_list = temp_list
 
         return full_list
 
+    # Pair each row with the first later row that duplicates it (see are_duplicates), then keep the unpaired rows.
+    # Candidates are looked up in buckets keyed on root_lang and root_word instead of comparing every pair of rows.
+    def merge_duplicates_pass(self, full_list):
+        buckets = {}  # root_lang -> (all rows, rows by root_word, rows with no root_word), as indices in list order
+        for i, l in enumerate(full_list):
+            if l[4] not in buckets:
+                buckets[l[4]] = (deque(), defaultdict(deque), deque())
+            all_idxs, word_idxs, empty_idxs = buckets[l[4]]
+            all_idxs.append(i)
+            if len(l[6]):
+                word_idxs[l[6]].append(i)
+            else:
+                empty_idxs.append(i)
+
+        temp_list = []
+        merged = [False] * len(full_list)
+        for i, l1 in enumerate(full_list):
+            if merged[i]:
+                continue
+
+            all_idxs, word_idxs, empty_idxs = buckets[l1[4]]
+            if len(l1[6]):  # Same root word, or no root word
+                j = min(self.first_unmerged(word_idxs[l1[6]], i, merged),
+                        self.first_unmerged(empty_idxs, i, merged))
+            else:  # An empty root word matches any root word
+                j = self.first_unmerged(all_idxs, i, merged)
+
+            if j < len(full_list):
+                temp_list.append(self.combine_duplicates(l1, full_list[j]))
+                merged[i] = merged[j] = True
+
+        for k, l in enumerate(full_list):
+            if not merged[k]:
+                temp_list.append(l)
+
+        return temp_list
+
+    # Index of the first row after row i that has not been merged yet, or len(merged) if there is none. Rows up to i
+    # can never be paired again, so they are dropped from the bucket.
     @staticmethod
-    def list_to_string(entry_list):
+    def first_unmerged(idxs, i, merged):
+        while len(idxs) and (idxs[0] <= i or merged[idxs[0]]):
+            idxs.popleft()
+        if len(idxs):
+            return idxs[0]
+        return len(merged)
+
+    @staticmethod
+    def list_to_row(entry_list):
         pos = entry_list[2]
         entry_list[2] = '/'.join(sorted(pos))
         entry_list = entry_list[:-1]
         entry_list[-1] = str(entry_list[-1])
+        entry_list.insert(7, get_script(entry_list[6]))  # root_script
         entry_list.append('wik')
-        return ','.join(entry_list)
+        return entry_list
 
-    def to_full_string(self):
+    @staticmethod
+    def list_to_string(entry_list):
+        return ','.join(WiktionaryEntry.list_to_row(entry_list))
+
+    # Output rows as lists of column strings, in the order they are written to the CSV
+    def to_full_rows(self):
+        return self.to_rows(self.to_final_list())
+
+    # Rows left once duplicates are merged, limited to the relations of the filter
+    def to_final_list(self):
         full_list = self.to_full_list()
         final_list = self.check_list_duplicates(full_list)
-        return '\n'.join([self.list_to_string(x) for x in sorted(final_list, key=lambda x: (x[-1], x[-2]))])
+        if self.filter is not None:
+            final_list = [x for x in final_list if self.filter.keep_relation(x[9])]
+        return final_list
+
+    # Output rows of an already merged list, sorted by etymology, then dist
+    @staticmethod
+    def to_rows(final_list):
+        return [WiktionaryEntry.list_to_row(x) for x in sorted(final_list, key=lambda x: (x[-1], x[-2]))]
+
+    def to_full_string(self):
+        return '\n'.join([','.join(row) for row in self.to_full_rows()])
 
 
 if __name__ == "__main__":
@@ -1,6 +1,15 @@
+from WiktionaryDump import WiktionaryDump
 from WiktionaryEntry import WiktionaryEntry
-from WiktionaryTags import WiktionaryTags
-import gc
+from WiktionaryFilter import WiktionaryFilter
+from WiktionaryStats import WiktionaryStats
+from WiktionaryTags import get_tags
+from WiktionaryTemplates import template_cache
+from WiktionaryWriter import WiktionaryWriter
+from collections import deque
+import argparse
+import json
+import os
+import time
 
 
 class WiktionaryExtractor(object):
@@ -10,37 +19,107 @@ class WiktionaryExtractor(object):
         self.current_page_title = None
         self.saving_flag = False  # When True, create WiktionaryEntry; when False, continue
 
-        self.TAGS = WiktionaryTags()
+        # Parallel mode: language sections are collected as (title, lines) and parsed by a pool of worker processes
+        self.collect_sections = False
+        self.sections = []
+        self.workers = os.cpu_count()
+        self.batch_size = 1000  # Language sections sent to a worker at a time
+        self.memory_limit = None  # In bytes. When exceeded, parallel parsing stops reading ahead until results drain
+        self.worker_cache_counts = [0, 0, 0]  # Template cache hits, misses and evictions reported by worker processes
+
+        self.TAGS = get_tags()
+        self.content_namespaces_only = True  # Skip templates, modules, appendices, etc. by the <ns> of their page
+        self.filter = None  # WiktionaryFilter, to extract only some languages and relations
+        # Plain XML, .bz2 or .gz. For a multistream .bz2 dump, the index is found next to it unless given explicitly
         self.wiktionary_dump_filepath = 'inputs/truncated_enwiktionary-20200820-pages-articles.xml'
+        self.dump_index_filepath = None
+        self.page_titles = None  # When set, only these pages are read, through the page index of the dump
+        self.read_ahead = 0  # Blocks of the dump read and decoded ahead of parsing by a background thread; 0 for none
+        self.read_block_size = 1 << 20  # Bytes of the dump file read at a time
 
-    @staticmethod
-    def write_entry(entry=None):
-        output_str = '1'
-        if entry is not None:
-            output_str = entry.to_full_string()
-        if len(output_str):
-            with open('outputs/WiktionaryOutput.csv', 'a', encoding='utf-8') as writer:
-                writer.write(output_str + '\n')
+        # Output sink, opened on the first write and closed at the end of run()
+        self.output_filepath = 'outputs/WiktionaryOutput.csv'
+        self.output_buffer_size = 1000  # Entries buffered before writing
+        self.output_flush_interval = 10.0  # Max seconds between writes
+        self.sqlite_filepath = None  # When set, rows are loaded into this SQLite database instead of the CSV file
+        self.shard_directory = None  # When set, rows are split by language into CSV files in this directory instead
+        self.shard_buckets = None  # Number of files languages are hashed into, instead of a file per language
+        self.writer = None
+
+        # Incremental extraction: each page's revision ID, sha1 and byte range in the output are recorded in a state
+        # file next to the output. Pages whose revision is unchanged since previous_output_filepath was written are not
+        # parsed again; their rows are copied from it.
+        self.track_revisions = False
+        self.previous_output_filepath = None
+        self.previous_state = {}
+        self.previous_output = None
+        self.state_file = None
+        self.page_start = 0
+        self.in_revision = False
+        self.current_revision_id = None
+        self.current_sha1 = ''
+        self.skip_page = False  # The current page is unchanged and is carried forward
+        self.state_position = 0  # Length of the state file
+
+        # Checkpoints: every checkpoint_interval seconds, the dump position of the page being written, its title and
+        # the lengths of the output and state files before it are saved next to the output. With resume, the files are
+        # truncated to those lengths and the dump is read from that page on.
+        self.checkpoint_interval = None
+        self.resume = False
+        self.dump = None
+        self.dump_start = (0, 0)  # See WiktionaryDump.seek
+        self.page_offset = None  # Dump position of the current page
+        self.page_boundary = (0, 0)  # Lengths of the output and state files once the last page was written
+        self.last_checkpoint = 0.0
+
+        self.stats = None  # WiktionaryStats, when instrumentation is enabled with enable_stats()
+
+    # The SQLite and sharded writers are only imported when used, as sqlite3 and multiprocessing slow down startup
+    def open_writer(self, mode='a'):
+        if self.sqlite_filepath is not None:
+            from WiktionaryDatabase import WiktionaryDatabase
+            return WiktionaryDatabase(self.sqlite_filepath)
+        if self.shard_directory is not None:
+            from WiktionaryShards import WiktionaryShardedWriter
+            return WiktionaryShardedWriter(self.shard_directory, self.output_buffer_size, self.output_flush_interval,
+                                           self.shard_buckets)
+        return WiktionaryWriter(self.output_filepath, self.output_buffer_size, self.output_flush_interval, mode)
+
+    def close_writer(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+    # Rows of one language section. With stats, the section, its rows and the time spent writing them are counted, in
+    # run() and run_parallel() alike.
+    def write_rows(self, rows):
+        start = time.perf_counter() if self.stats is not None else 0.0
+        if len(rows):
+            if self.writer is None:
+                self.writer = self.open_writer()
+            self.writer.write_rows(rows)
+        if self.stats is not None:
+            self.stats.timers['write'] += time.perf_counter() - start
+            self.stats.counters['sections_saved'] += 1
+            self.stats.counters['rows_emitted'] += len(rows)
+
+    # With stats, the time spent parsing, merging and formatting the rows is counted as in the worker processes
+    def write_entry(self, title, text):
+        timings = self.stats.timers if self.stats is not None else None
+        self.write_rows(parse_section(title, text, self.TAGS, timings, self.filter))
 
     # Create a new WiktionaryEntry object and either write to output CSV file or append to self.entries
     def create_entry(self, write=False):
-        if self.current_page_title == 'abansada':
-            print('CREATING')
-            new_entry = WiktionaryEntry(self.current_page_title, self.current_entry_text)
-            print(self.current_entry_text)
-            print(new_entry)
-            print(new_entry.to_full_string())
-            if write:
-                self.write_entry(new_entry)
-            else:
-                self.entries.append(new_entry)
-
-            self.saving_flag = False
+        if self.collect_sections:
+            self.sections.append((self.current_page_title, self.current_entry_text))
+        elif write:
+            self.write_entry(self.current_page_title, self.current_entry_text)
         else:
-            self.write_entry()
+            self.entries.append(WiktionaryEntry(self.current_page_title, self.current_entry_text, self.TAGS,
+                                                self.filter))
 
+        self.saving_flag = False
         self.current_entry_text = []
-        gc.collect()
 
     @staticmethod
     def is_meta(line):
@@ -57,9 +136,29 @@ class WiktionaryExtractor(object):
             self.current_page_title = meta_line[len(word_tag):-(len(word_tag) + 1)]
             if ':' in self.current_page_title[:11]:  # This is an explanatory page, not a definitions page
                 self.saving_flag = False
+        elif self.track_revisions or self.checkpoint_interval is not None:
+            self.process_revision_meta(meta_line)
 
-            if self.current_page_title == 'abansada':
-                print('Found')
+    def process_revision_meta(self, meta_line):
+        if meta_line == '<page>':
+            self.in_revision = False
+            self.current_revision_id = None
+            self.current_sha1 = ''
+            self.skip_page = False
+            if self.checkpoint_interval is not None:
+                self.page_offset = self.dump.page_offsets.popleft()
+        elif meta_line == '<revision>':
+            self.in_revision = True
+        elif self.in_revision and self.current_revision_id is None and meta_line[:4] == '<id>':
+            self.current_revision_id = meta_line[4:-5]
+            previous = self.previous_state.get(self.current_page_title)
+            if previous is not None and previous[0] == self.current_revision_id:
+                self.skip_page = True
+        elif meta_line[:6] == '<sha1>':
+            self.current_sha1 = meta_line[6:-7]
+        elif meta_line == '</page>' and self.collect_sections:
+            self.sections.append(PageEnd(self.current_page_title, self.current_revision_id, self.current_sha1,
+                                         self.skip_page, self.page_offset))
 
     @staticmethod
     def get_header_depth(header_line):
@@ -87,16 +186,19 @@ class WiktionaryExtractor(object):
                 self.create_entry(write=True)
 
             lang = header_line[lang_depth:-lang_depth]
-            if lang in self.TAGS.lang2iso:
-                self.saving_flag = True
+            if lang in self.TAGS.lang2iso and not self.skip_page:
+                self.saving_flag = self.keep_language(self.TAGS.lang2iso[lang])
 
     def process_lang_id(self, line):
         lang_id = line[18:-2]
         if self.saving_flag:
             self.create_entry(write=True)
 
-        if lang_id in self.TAGS.iso2lang:
-            self.saving_flag = True
+        if lang_id in self.TAGS.iso2lang and not self.skip_page:
+            self.saving_flag = self.keep_language(self.TAGS.lang2iso[self.TAGS.iso2lang[lang_id]])
+
+    def keep_language(self, iso):
+        return self.filter is None or self.filter.keep_language(iso)
 
     def process_line(self, line):
         line = line.strip()
@@ -112,37 +214,411 @@ class WiktionaryExtractor(object):
         if self.saving_flag:
             self.current_entry_text.append(line)
 
+    def open_dump(self):
+        dump = WiktionaryDump(self.wiktionary_dump_filepath, self.dump_index_filepath, self.workers)
+        dump.content_namespaces_only = self.content_namespaces_only
+        dump.read_ahead = self.read_ahead
+        dump.block_size = self.read_block_size
+        dump.seek(*self.dump_start)
+        if self.checkpoint_interval is not None:
+            dump.page_offsets = deque()
+        return dump
+
+    # Lines of the dump, counted by stats when instrumentation is enabled
+    def iter_lines(self):
+        if self.page_titles is not None:
+            return self.iter_page_lines()
+        dump = self.dump = self.open_dump()
+        if self.stats is None:
+            return iter(dump)
+        self.stats.total_bytes = dump.get_size()
+        return self.stats.iter_lines(dump)
+
+    # Lines of the pages in page_titles, in that order, read without a pass over the dump. The page index is built once
+    # with "python WiktionaryPages.py --dump <dump> build".
+    def iter_page_lines(self):
+        from WiktionaryPages import WiktionaryPages
+        with WiktionaryPages(self.wiktionary_dump_filepath, self.dump_index_filepath) as pages:
+            for title in self.page_titles:
+                yield from pages.get_lines(title)
+
+    # Count lines, pages, sections, rows and the time spent in each stage, printing a progress line every interval
+    # seconds (None for no progress lines)
+    def enable_stats(self, interval=10.0):
+        self.stats = WiktionaryStats(interval=interval)
+        return self.stats
+
     def run(self):
-        with open(self.wiktionary_dump_filepath, 'r+', encoding='utf-8') as f:
-            for line in f:
+        try:
+            for line in self.iter_lines():
                 self.process_line(line)
+            if self.saving_flag:
+                self.create_entry(write=True)
+        finally:
+            self.close_writer()
+
+    # Yield each language section as (title, lines) as soon as the dump has been read past it. When revisions are
+    # tracked, a PageEnd follows the sections of each page.
+    def iter_sections(self):
+        self.collect_sections = True
+        try:
+            for line in self.iter_lines():
+                self.process_line(line)
+                if len(self.sections):
+                    sections = self.sections
+                    self.sections = []
+                    yield from sections
+
+            if self.saving_flag:
+                self.create_entry()
+            yield from self.sections
+        finally:
+            self.sections = []
+            self.collect_sections = False
+
+    # Split the dump into batches of language sections for the worker pool
+    def iter_section_batches(self):
+        batch = []
+        for section in self.iter_sections():
+            batch.append(section)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if len(batch):
+            yield batch
+
+    # Stream a WiktionaryEntry for every language section. Nothing is kept after an entry is yielded.
+    def iter_entries(self):
+        for section in self.iter_sections():
+            if type(section) is tuple:
+                yield WiktionaryEntry(section[0], section[1], self.TAGS, self.filter)
+
+    # Stream (section, rows) for every language section, in dump order; rows is None for a PageEnd. With workers,
+    # sections are parsed in a pool of worker processes; at most two batches per worker are in flight, and none are
+    # added while the process is above memory_limit.
+    def iter_section_rows(self, workers=0):
+        if workers <= 0:
+            timings = self.stats.timers if self.stats is not None else None
+            for section in self.iter_sections():
+                if type(section) is tuple:
+                    yield section, parse_section(section[0], section[1], self.TAGS, timings, self.filter)
+                else:
+                    yield section, None
+            return
+
+        import multiprocessing  # Only imported by runs with a worker pool; it is the slowest import at startup
+        max_pending = 2 * workers
+        pending = deque()
+        with multiprocessing.Pool(workers, initializer=get_tags) as pool:
+            for batch in self.iter_section_batches():
+                pending.append((batch, pool.apply_async(parse_sections, (batch, self.stats is not None, self.filter))))
+                while len(pending) >= max_pending or (len(pending) > 1 and self.over_memory_limit()):
+                    yield from self.collect_batch(*pending.popleft())
+            while len(pending):
+                yield from self.collect_batch(*pending.popleft())
+
+    def collect_batch(self, batch, result):
+        section_rows, cache_counts, timings = result.get()
+        for i, count in enumerate(cache_counts):
+            self.worker_cache_counts[i] += count
+        if timings is not None:
+            self.stats.add_timings(timings)
+        return zip(batch, section_rows)
+
+    # Template cache counters for this process and its workers, for logging at the end of a run
+    def cache_stats(self):
+        stats = template_cache.stats()
+        stats['hits'] += self.worker_cache_counts[0]
+        stats['misses'] += self.worker_cache_counts[1]
+        stats['evictions'] += self.worker_cache_counts[2]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+    # Stream output rows (lists of column strings), so callers can write them to their own sinks
+    def iter_rows(self, workers=0):
+        for _, rows in self.iter_section_rows(workers):
+            if rows is not None:
+                yield from rows
 
-    def test_cycle(self):
-        stream_len = 100000
-        import time
-        start = time.time()
-        with open(self.wiktionary_dump_filepath, 'r+', encoding='utf-8') as f:
-            end_index = float('inf')
-            stream = [None]*stream_len
-            for i, line in enumerate(f):
-                if line.strip() == '<title>abansada</title>':
-                    end_index = i + 100
-                elif i > end_index:
-                    extract_lines = stream[i % stream_len:] + stream[:i % stream_len]
-                    with open('inputs/truncated_enwiktionary-20200820-pages-articles.xml', 'w', encoding='utf-8') as w:
-                        for extract_line in extract_lines:
-                            w.write(extract_line)
-                            w.write('\n')
-                    break
-                stream[i % stream_len] = line[:-1]
-
-        print('Time: {:02f} sec'.format(time.time() - start))
+    def over_memory_limit(self):
+        return self.memory_limit is not None and get_rss() > self.memory_limit
+
+    # Parse language sections in a pool of worker processes (or inline, with 0 workers). Results are written in dump
+    # order, so the output is the same for any number of workers.
+    def run_parallel(self, workers=None, batch_size=None):
+        if workers is not None:
+            self.workers = workers
+        if batch_size is not None:
+            self.batch_size = batch_size
+
+        try:
+            self.load_checkpoint()
+            self.open_state()
+            self.open_checkpoint()
+            for section, rows in self.iter_section_rows(self.workers):
+                if rows is None:
+                    if self.track_revisions:
+                        self.end_page(section)
+                    if self.checkpoint_interval is not None:
+                        self.checkpoint_page(section)
+                else:
+                    self.write_rows(rows)
+            if self.checkpoint_interval is not None:  # Nothing left to resume
+                os.remove(self.get_checkpoint_filepath())
+        finally:
+            self.close_writer()
+            self.close_state()
+
+    def get_state_filepath(self, output_filepath):
+        return output_filepath + '.state'
+
+    # State lines are "title, revision ID, sha1, start, end" separated by tabs, with the byte range of the page's rows
+    def load_state(self, output_filepath):
+        state = {}
+        with open(self.get_state_filepath(output_filepath), 'r', encoding='utf-8') as f:
+            for line in f:
+                title, revision_id, sha1, start, end = line.rstrip('\n').split('\t')
+                state[title] = (revision_id, sha1, int(start), int(end))
+        return state
+
+    # A tracked run rewrites the output and state files, unless it resumes from a checkpoint. Rows of unchanged pages
+    # are copied from the previous output while the new one is written, so the two cannot be the same file.
+    def open_state(self):
+        if self.previous_output_filepath is not None:
+            if os.path.realpath(self.previous_output_filepath) == os.path.realpath(self.output_filepath):
+                raise ValueError('The previous output {} is also the output: move it aside or write to another file'
+                                 .format(self.previous_output_filepath))
+            self.track_revisions = True
+            self.previous_state = self.load_state(self.previous_output_filepath)
+            self.previous_output = open(self.previous_output_filepath, 'rb')
+        if not self.track_revisions:
+            return
+        if self.sqlite_filepath is not None or self.shard_directory is not None:
+            raise ValueError('Revisions can only be tracked for CSV output')
+        mode = 'a' if self.resume else 'w'
+        self.writer = self.open_writer(mode)
+        self.page_start = self.writer.position
+        state_filepath = self.get_state_filepath(self.output_filepath)
+        self.state_file = open(state_filepath, mode, encoding='utf-8', newline='\n')
+        self.state_position = os.path.getsize(state_filepath)
+
+    def close_state(self):
+        if self.state_file is not None:
+            self.state_file.close()
+            self.state_file = None
+        if self.previous_output is not None:
+            self.previous_output.close()
+            self.previous_output = None
+
+    # All rows of the page have been written: copy them from the previous output if the page is unchanged, then record
+    # where they are
+    def end_page(self, page_end):
+        if page_end.unchanged:
+            _, _, start, end = self.previous_state[page_end.title]
+            self.previous_output.seek(start)
+            self.writer.write_bytes(self.previous_output.read(end - start))
+        line = '{}\t{}\t{}\t{}\t{}\n'.format(page_end.title, page_end.revision_id, page_end.sha1, self.page_start,
+                                             self.writer.position)
+        self.state_file.write(line)
+        self.state_position += len(line.encode('utf-8'))
+        self.page_start = self.writer.position
+
+    def get_checkpoint_filepath(self):
+        return self.output_filepath + '.checkpoint'
+
+    # With resume, truncate the output and state files to the last checkpoint and start reading the dump from there
+    def load_checkpoint(self):
+        if not self.resume:
+            return
+        with open(self.get_checkpoint_filepath(), 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if (checkpoint['dump'] != os.path.abspath(self.wiktionary_dump_filepath) or
+                checkpoint['dump_size'] != os.path.getsize(self.wiktionary_dump_filepath)):
+            raise ValueError('The checkpoint is for another dump: {}'.format(checkpoint['dump']))
+
+        filepaths = [self.output_filepath]
+        if checkpoint['state_length'] is not None:
+            filepaths.append(self.get_state_filepath(self.output_filepath))
+        for filepath, length in zip(filepaths, (checkpoint['output_length'], checkpoint['state_length'])):
+            with open(filepath, 'r+b') as f:
+                f.truncate(length)
+        self.dump_start = (checkpoint['stream_offset'], checkpoint['offset'])
+        print('Resuming at {} (byte {} of the output)'.format(checkpoint['title'] or 'the start of the dump',
+                                                              checkpoint['output_length']))
+
+    def open_checkpoint(self):
+        if self.checkpoint_interval is None:
+            return
+        if self.sqlite_filepath is not None or self.shard_directory is not None:
+            raise ValueError('Checkpoints can only be saved for CSV output')
+        if self.page_titles is not None:
+            raise ValueError('Checkpoints can only be saved for a pass over the whole dump')
+        if self.writer is None:
+            self.writer = self.open_writer()
+        self.page_boundary = (self.writer.position, self.state_position)
+        self.save_checkpoint(self.dump_start, '')
+
+    # The page has been written: every checkpoint_interval seconds, save a checkpoint to redo it from. Rows of the
+    # pages before it are flushed to disk first.
+    def checkpoint_page(self, page_end):
+        if time.monotonic() - self.last_checkpoint >= self.checkpoint_interval:
+            self.save_checkpoint(page_end.offset, page_end.title)
+        self.page_boundary = (self.writer.position, self.state_position)
+
+    def save_checkpoint(self, dump_position, title):
+        self.writer.flush()
+        for f in (self.writer.file, self.state_file):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+        checkpoint = {'dump': os.path.abspath(self.wiktionary_dump_filepath),
+                      'dump_size': os.path.getsize(self.wiktionary_dump_filepath),
+                      'stream_offset': dump_position[0],
+                      'offset': dump_position[1],
+                      'title': title,
+                      'output_length': self.page_boundary[0],
+                      'state_length': self.page_boundary[1] if self.state_file is not None else None}
+        checkpoint_filepath = self.get_checkpoint_filepath()
+        with open(checkpoint_filepath + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(checkpoint_filepath + '.tmp', checkpoint_filepath)  # A crash never leaves half a checkpoint
+        self.last_checkpoint = time.monotonic()
+
+
+# Marks the end of a page in the stream of language sections when revisions are tracked or checkpoints saved. offset is
+# the dump position of the page, when checkpoints are saved.
+class PageEnd(object):
+    __slots__ = ('title', 'revision_id', 'sha1', 'unchanged', 'offset')
+
+    def __init__(self, title, revision_id, sha1, unchanged, offset=None):
+        self.title = title
+        self.revision_id = revision_id
+        self.sha1 = sha1
+        self.unchanged = unchanged
+        self.offset = offset
+
+
+# Output rows of one language section. When a dict of timers is given, the time spent parsing, merging duplicates and
+# formatting rows is added to it.
+def parse_section(title, text, tags, timings=None, entry_filter=None):
+    if timings is None:
+        return WiktionaryEntry(title, text, tags, entry_filter).to_full_rows()
+    start = time.perf_counter()
+    entry = WiktionaryEntry(title, text, tags, entry_filter)
+    parsed = time.perf_counter()
+    final_list = entry.to_final_list()
+    merged = time.perf_counter()
+    rows = entry.to_rows(final_list)
+    timings['parse'] += parsed - start
+    timings['merge'] += merged - parsed
+    timings['format'] += time.perf_counter() - merged
+    return rows
+
+
+# Worker process entry point: parse a batch of (title, lines) language sections into their output rows (None for a
+# PageEnd). Also returns how the worker's template cache counters changed, so the parent can report totals, and with
+# timed, the time spent in each stage.
+def parse_sections(sections, timed=False, entry_filter=None):
+    tags = get_tags()
+    timings = {'parse': 0.0, 'merge': 0.0, 'format': 0.0} if timed else None
+    before = (template_cache.hits, template_cache.misses, template_cache.evictions)
+    section_rows = [parse_section(section[0], section[1], tags, timings, entry_filter) if type(section) is tuple
+                    else None for section in sections]
+    after = (template_cache.hits, template_cache.misses, template_cache.evictions)
+    return section_rows, [a - b for a, b in zip(after, before)], timings
+
+
+# Resident set size of the current process in bytes
+def get_rss():
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # Peak RSS (KB on Linux) where not available
 
 
 if __name__ == "__main__":
-    scraper = WiktionaryExtractor()
-    scraper.run()
+    parser = argparse.ArgumentParser(description='Extract etymologies from a Wiktionary XML dump')
+    parser.add_argument('--dump', help='Path to the dump (.xml, .xml.bz2, .xml.gz or multistream .xml.bz2)')
+    parser.add_argument('--index', help='Index file of a multistream dump, if not next to the dump')
+    parser.add_argument('--page', action='append',
+                        help='Only extract this page, read through the page index of the dump (can be repeated)')
+    parser.add_argument('--output', default='outputs/WiktionaryOutput.csv', help='Path of the output CSV file')
+    parser.add_argument('--sqlite', help='Load the rows into this SQLite database instead of the output CSV file')
+    parser.add_argument('--shards', help='Split the rows by language into CSV files in this directory instead, with a '
+                                         'manifest of their row counts and sizes')
+    parser.add_argument('--shard-buckets', type=int, help='Hash languages into this many shard files')
+    parser.add_argument('--merge-shards', help='After the run, merge the shards into this CSV file sorted by language '
+                                               'and word')
+    parser.add_argument('--all-namespaces', action='store_true',
+                        help='Also read pages outside the main and Reconstruction namespaces (templates, etc.)')
+    parser.add_argument('--languages', help='Only extract these languages, e.g. ind,hil,srn')
+    parser.add_argument('--relations', help='Only extract these relations, e.g. bor,inh')
+    parser.add_argument('--track-revisions', action='store_true',
+                        help='Record the revision of every page in a state file next to the output')
+    parser.add_argument('--previous-output',
+                        help='Output of an earlier run with tracked revisions; unchanged pages are copied from it')
+    parser.add_argument('--checkpoint-interval', type=float,
+                        help='Seconds between checkpoints saved next to the output, to --resume from after a crash')
+    parser.add_argument('--resume', action='store_true',
+                        help='Truncate the output to its last checkpoint and continue the run from there')
+    parser.add_argument('--read-ahead', type=int, default=0,
+                        help='Blocks of the dump read ahead of parsing by a background thread (0 to read in line)')
+    parser.add_argument('--read-block-size', type=int, default=1024,
+                        help='KB of the dump file read at a time')
+    parser.add_argument('--buffer-size', type=int, default=1000, help='Entries buffered before writing to the output')
+    parser.add_argument('--flush-interval', type=float, default=10.0, help='Max seconds between output writes')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Number of worker processes for parallel parsing (0 parses in a single process)')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Language sections per worker batch')
+    parser.add_argument('--memory-limit', type=int, help='Memory ceiling in MB for reading ahead in parallel mode')
+    parser.add_argument('--stats', help='Count and time each stage of the run and save a JSON report to this path')
+    parser.add_argument('--progress-interval', type=float, default=10.0,
+                        help='Seconds between progress lines when --stats is given')
+    parser.add_argument('--template-cache-size', type=int, default=template_cache.maxsize,
+                        help='Parsed template lines kept per process (0 disables the cache)')
+    args = parser.parse_args()
 
-    for entry in scraper.entries:
-        print(entry.to_full_string())
-    # scraper.test_cycle()
+    scraper = WiktionaryExtractor()
+    if args.dump is not None:
+        scraper.wiktionary_dump_filepath = args.dump
+    scraper.dump_index_filepath = args.index
+    scraper.page_titles = args.page
+    scraper.output_filepath = args.output
+    scraper.sqlite_filepath = args.sqlite
+    scraper.shard_directory = args.shards
+    scraper.shard_buckets = args.shard_buckets
+    scraper.content_namespaces_only = not args.all_namespaces
+    if args.languages is not None or args.relations is not None:
+        scraper.filter = WiktionaryFilter(args.languages.split(',') if args.languages is not None else None,
+                                          args.relations.split(',') if args.relations is not None else None)
+    scraper.track_revisions = args.track_revisions
+    scraper.previous_output_filepath = args.previous_output
+    scraper.checkpoint_interval = args.checkpoint_interval
+    scraper.resume = args.resume
+    if args.resume and args.checkpoint_interval is None:
+        scraper.checkpoint_interval = 300.0
+    scraper.read_ahead = args.read_ahead
+    scraper.read_block_size = args.read_block_size * 1024
+    scraper.output_buffer_size = args.buffer_size
+    scraper.output_flush_interval = args.flush_interval
+    if args.memory_limit is not None:
+        scraper.memory_limit = args.memory_limit * 1024 * 1024
+    template_cache.resize(args.template_cache_size)
+    if args.stats is not None:
+        scraper.enable_stats(args.progress_interval)
+    if (args.workers > 0 or args.track_revisions or args.previous_output is not None or
+            scraper.checkpoint_interval is not None):
+        scraper.run_parallel(args.workers, args.batch_size)
+    else:
+        scraper.run()
+    print('Template cache: {hits} hits, {misses} misses, {evictions} evictions ({hit_rate:.1%} hit rate)'.format(
+        **scraper.cache_stats()))
+    if args.shards is not None and args.merge_shards is not None:
+        from WiktionaryShards import merge_shards
+        merge_shards(args.shards, args.merge_shards, workers=args.workers or None)
+    if args.stats is not None:
+        scraper.stats.save(args.stats)
+        print(scraper.stats.get_progress())
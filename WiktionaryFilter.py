@@ -0,0 +1,52 @@
+import re
+from WiktionaryTags import get_tags
+
+
+# Limits an extraction to some languages (ISO codes as in the output, e.g. 'ind') and relations (e.g. 'bor'). Either
+# can be None for no limit. Sections of other languages are never buffered, and templates that never give a row (links,
+# mentions, affixes...) are dropped before brace parsing. Rows of other relations are only dropped once duplicates are
+# merged, as a row can be merged into a row of another relation, so the rows are the same as in a full extraction.
+class WiktionaryFilter(object):
+    def __init__(self, languages=None, relations=None, tags=None):
+        tags = tags if tags is not None else get_tags()
+        self.languages = None
+        self.relations = None
+
+        if languages is not None:
+            self.languages = frozenset([self.get_iso(tags, lang) for lang in languages])
+        if relations is not None:
+            known = set(tags.save_ety_tags.values())
+            for relation in relations:
+                if relation not in known:
+                    raise ValueError('Unknown relation {} (expected one of {})'.format(relation,
+                                                                                      ', '.join(sorted(known))))
+            self.relations = frozenset(relations)
+
+        # Middle Chinese roots can be given by an {{ltc-l}} template following the etymology template
+        self.templates = frozenset(list(tags.save_ety_tags) + ['ltc-l'])
+        self.template_pattern = re.compile(r'\{\{(?:' + '|'.join([re.escape(t) for t in sorted(self.templates)]) +
+                                           r')[|}]')
+
+    # Codes are normalized the way WiktionaryEntry sets iso_code, so 2-letter codes are accepted too
+    @staticmethod
+    def get_iso(tags, lang):
+        if lang in tags.iso2lang:
+            return tags.lang2iso[tags.iso2lang[lang]]
+        if lang in tags.lang2iso.values():
+            return lang
+        raise ValueError('Unknown language code {}'.format(lang))
+
+    def keep_language(self, iso):
+        return self.languages is None or iso in self.languages
+
+    def keep_relation(self, relation):
+        return self.relations is None or relation in self.relations
+
+    # Whether a line of an etymology section has a template worth parsing
+    def keep_line(self, line):
+        return self.template_pattern.search(line) is not None
+
+    # etym is a template as parsed by WiktionaryTemplates; the name of a compound is that of its first part
+    def keep_template(self, etym):
+        name = etym[0][0][1] if type(etym[0][0]) is tuple else etym[0][1]
+        return name in self.templates
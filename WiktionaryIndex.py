@@ -0,0 +1,144 @@
+import argparse
+import mmap
+import os
+from array import array
+from WiktionaryEntry import OUTPUT_COLUMNS
+
+WORD_COLUMNS = (OUTPUT_COLUMNS.index('lang'), OUTPUT_COLUMNS.index('word'))
+ROOT_COLUMNS = (OUTPUT_COLUMNS.index('root_lang'), OUTPUT_COLUMNS.index('root_word'))
+INDEXES = {'word': WORD_COLUMNS, 'root': ROOT_COLUMNS}
+
+
+def get_index_filepath(csv_fp, name):
+    return '{}.{}.idx'.format(csv_fp, name)
+
+
+def get_key(line, columns):
+    fields = line.rstrip(b'\r\n').split(b',', max(columns) + 1)
+    if len(fields) <= max(columns):
+        return None
+    return tuple([fields[c] for c in columns])
+
+
+# One-time build: for every index, the byte offsets of the CSV lines sorted by their key columns, stored as a flat
+# array of unsigned 64-bit integers
+def build_index(csv_fp='outputs/WiktionaryOutput.csv'):
+    keyed = {name: [] for name in INDEXES}
+    with open(csv_fp, 'rb') as f:
+        offset = 0
+        for line in f:
+            for name, columns in INDEXES.items():
+                key = get_key(line, columns)
+                if key is not None:
+                    keyed[name].append((key, offset))
+            offset += len(line)
+
+    for name, entries in keyed.items():
+        entries.sort()
+        with open(get_index_filepath(csv_fp, name), 'wb') as f:
+            array('Q', [offset for _, offset in entries]).tofile(f)
+
+
+# Answers lookups by binary search over the memory-mapped CSV and index files. Only the lines touched by the search
+# are read, so memory use does not grow with the size of the dictionary.
+class WiktionaryIndex(object):
+    def __init__(self, csv_fp='outputs/WiktionaryOutput.csv'):
+        self.csv_fp = csv_fp
+        self.files = []
+        self.maps = []
+        self.csv = self.map_file(csv_fp)
+        self.offsets = {}
+        for name in INDEXES:
+            index_fp = get_index_filepath(csv_fp, name)
+            if os.path.getmtime(index_fp) < os.path.getmtime(csv_fp):
+                raise ValueError('{} is older than {}, rebuild the index'.format(index_fp, csv_fp))
+            index_map = self.map_file(index_fp)
+            self.offsets[name] = memoryview(index_map).cast('Q') if index_map is not None else []
+
+    def map_file(self, filepath):
+        f = open(filepath, 'rb')
+        self.files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.maps.append(m)
+        return m
+
+    def read_line(self, offset):
+        end = self.csv.find(b'\n', offset)
+        if end < 0:
+            end = len(self.csv)
+        return self.csv[offset:end]
+
+    def lookup(self, name, *key):
+        columns = INDEXES[name]
+        key = tuple([k.encode('utf-8') for k in key])
+        offsets = self.offsets[name]
+
+        lo, hi = 0, len(offsets)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if get_key(self.read_line(offsets[mid]), columns) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        rows = []
+        while lo < len(offsets):
+            line = self.read_line(offsets[lo])
+            if get_key(line, columns) != key:
+                break
+            rows.append(line.decode('utf-8').rstrip('\r').split(','))
+            lo += 1
+        return rows
+
+    # Etymology rows of a word, e.g. lookup_word('ind', 'kantor')
+    def lookup_word(self, lang, word):
+        return self.lookup('word', lang, word)
+
+    # Rows of the words that derive from a source word, e.g. lookup_root('nld', 'kantoor')
+    def lookup_root(self, root_lang, root_word):
+        return self.lookup('root', root_lang, root_word)
+
+    def close(self):
+        for offsets in self.offsets.values():
+            if isinstance(offsets, memoryview):
+                offsets.release()
+        self.offsets = {}
+        for m in self.maps:  # After the memoryviews, which keep their map from closing
+            m.close()
+        self.maps = []
+        for f in self.files:
+            f.close()
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Build or query the lookup index of the extracted etymology CSV')
+    parser.add_argument('--csv', default='outputs/WiktionaryOutput.csv', help='Path of the extracted CSV file')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('build', help='Build the index files next to the CSV file')
+    word_parser = subparsers.add_parser('word', help='Etymology rows of a word')
+    word_parser.add_argument('lang')
+    word_parser.add_argument('word')
+    root_parser = subparsers.add_parser('root', help='Rows of the words that derive from a source word')
+    root_parser.add_argument('root_lang')
+    root_parser.add_argument('root_word')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        build_index(args.csv)
+    else:
+        with WiktionaryIndex(args.csv) as index:
+            if args.command == 'word':
+                results = index.lookup_word(args.lang, args.word)
+            else:
+                results = index.lookup_root(args.root_lang, args.root_word)
+            for row in results:
+                print(','.join(row))
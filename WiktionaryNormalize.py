@@ -0,0 +1,59 @@
+import re
+
+reconstruction_pattern = re.compile(r'^Reconstruction:[\w ]+/')
+parens_brackets_pattern = re.compile(r'\([^)]*\)|[\[\]]')
+# Subscripts and superscripts (e.g. numbered homographs), raw or HTML-escaped as they are in the dump
+markup_pattern = re.compile(r'<sub>\w*</sub>|<sup>\w*</sup>\.?|'
+                            r'&lt;sub&gt;\w*&lt;/sub&gt;|&lt;sup&gt;\w*&lt;/sup&gt;\.?')
+# The markup patterns one at a time, in the order they were always applied
+markup_steps = (re.compile(r'<sub>\w*</sub>'), re.compile(r'<sup>\w*</sup>\.?'),
+                re.compile(r'&lt;sub&gt;\w*&lt;/sub&gt;'), re.compile(r'&lt;sup&gt;\w*&lt;/sup&gt;\.?'))
+no_brackets = str.maketrans('', '', '[]')
+no_brackets_parens = str.maketrans('', '', '[]()')
+
+
+# Denote reconstructions with *
+def normalize_word(word):
+    if word[:15] != 'Reconstruction:':
+        return word
+    return reconstruction_pattern.sub('*', word, 1)
+
+
+# Root words of a template argument: text in parentheses and brackets are dropped, then the argument is split in two
+# at the first ', '. A single word has its whitespace turned into '+'.
+def normalize_src_word(src_word):
+    if '(' in src_word:
+        src_word = parens_brackets_pattern.sub('', src_word)
+    else:
+        src_word = src_word.translate(no_brackets)
+
+    splits = src_word.find(', ')
+    if splits >= 0:
+        return [src_word[:splits], src_word[splits + 2:]]
+    return ['+'.join(src_word.split())]
+
+
+# A romanization or transcription without brackets and sub/superscripts. Markup is removed in one pass, unless removing
+# one tag can change what another matches: then the patterns are applied one after the other, as they always were.
+# That is when a closing tag is left (markup nested in markup), or when a superscript could take a period that only
+# follows it once a subscript is removed.
+def normalize_tr(string):
+    string = string.translate(no_brackets)
+    if '<' not in string and '&' not in string:
+        return string
+
+    processed = markup_pattern.sub('', string)
+    if ('</su' in processed or '&lt;/su' in processed or
+            ('.' in processed and ('</sup>' in string or '&lt;/sup&gt;' in string))):
+        processed = string
+        for pattern in markup_steps:
+            processed = pattern.sub('', processed)
+    return processed
+
+
+def normalize_roman(rom):
+    return rom.replace(' ', '+')
+
+
+def strip_brackets_parens(word):
+    return word.translate(no_brackets_parens)
@@ -0,0 +1,174 @@
+from WiktionaryDump import WiktionaryDump
+import argparse
+import mmap
+import os
+
+
+def get_page_index_filepath(dump_fp):
+    return dump_fp + '.pages'
+
+
+# A title as it is written in the dump, e.g. 'R&amp;D'. Not xml.sax.saxutils.escape, which imports urllib.
+def escape_title(title):
+    return title.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
+
+
+# (title, stream offset, offset, length) of every page of a dump, with the position of its <page> line as given to
+# WiktionaryDump.seek and the length of the page up to the end of its </page> line. Blocks are cut after their last
+# line, so the <title> line and the </page> line are never split.
+def iter_page_positions(dump):
+    rest = b''
+    page = None  # [stream offset, offset, title] of the page being read
+    for stream, position, block in dump.iter_blocks():
+        position -= len(rest)
+        data = rest + block
+        end = data.rfind(b'\n') + 1
+        data, rest = data[:end], data[end:]
+        pos = 0
+        while True:
+            if page is None:
+                start = data.find(b'<page>', pos)
+                if start < 0:
+                    break
+                page = [stream, position + data.rfind(b'\n', 0, start) + 1, None]
+                pos = start
+            if page[2] is None:
+                title = data.find(b'<title>', pos)
+                if title < 0:
+                    break
+                pos = data.find(b'</title>', title)
+                page[2] = data[title + 7:pos].decode('utf-8')
+            close = data.find(b'</page>', pos)
+            if close < 0:
+                break
+            pos = data.find(b'\n', close) + 1 or len(data)
+            yield page[2], page[0], page[1], position + pos - page[1]
+            page = None
+
+
+# One-time pass over the dump: writes "title, stream offset, offset, length" lines, separated by tabs and sorted by
+# title, to the page index next to the dump. Pages of a multistream dump are located in their own bz2 stream, so that
+# reading one only decompresses that stream.
+def build_page_index(dump_fp, index_fp=None, workers=None):
+    dump = WiktionaryDump(dump_fp, index_fp, workers)
+    if dump.index_filepath is not None:
+        dump.workers = max(dump.workers, 2)  # Only the worker pool reads a multistream dump stream by stream
+        dump.streams_per_chunk = 1
+    pages = sorted([(title.encode('utf-8'), stream, offset, length)
+                    for title, stream, offset, length in iter_page_positions(dump)])
+    with open(get_page_index_filepath(dump_fp), 'wb') as f:
+        for title, stream, offset, length in pages:
+            f.write(b'%s\t%d\t%d\t%d\n' % (title, stream, offset, length))
+    return len(pages)
+
+
+# Random access to the pages of a dump through its page index. Lookups are binary searches over the memory-mapped
+# index; pages of a plain XML dump are read from the memory-mapped dump, pages of a compressed dump are decompressed
+# from the start of their stream (for a dump that is not multistream, from the start of the file).
+class WiktionaryPages(object):
+    def __init__(self, dump_fp, index_fp=None):
+        page_index_fp = get_page_index_filepath(dump_fp)
+        if os.path.getmtime(page_index_fp) < os.path.getmtime(dump_fp):
+            raise ValueError('{} is older than {}, rebuild the page index'.format(page_index_fp, dump_fp))
+        self.dump = WiktionaryDump(dump_fp, index_fp, 1)
+        self.files = []
+        self.index = self.map_file(page_index_fp)
+        self.dump_map = None
+        if not dump_fp.endswith('.bz2') and not dump_fp.endswith('.gz'):
+            self.dump_map = self.map_file(dump_fp)
+
+    def map_file(self, filepath):
+        f = open(filepath, 'rb')
+        self.files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    # (stream offset, offset, length) of a page, or None. Titles are looked up as given, then XML-escaped as they are
+    # in the dump (e.g. '&amp;').
+    def find(self, title):
+        for key in dict.fromkeys([title, escape_title(title)]):
+            position = self.find_key(key.encode('utf-8'))
+            if position is not None:
+                return position
+        return None
+
+    def find_key(self, key):
+        index = self.index
+        lo, hi = 0, len(index)
+        while lo < hi:  # Byte positions: find the line around mid, then continue after or before it
+            mid = (lo + hi) // 2
+            start = index.rfind(b'\n', 0, mid) + 1
+            end = index.find(b'\n', start)
+            if index[start:index.find(b'\t', start)] < key:
+                lo = end + 1
+            else:
+                hi = start
+        if lo >= len(index):
+            return None
+        fields = index[lo:index.find(b'\n', lo)].split(b'\t')
+        if fields[0] != key:
+            return None
+        return int(fields[1]), int(fields[2]), int(fields[3])
+
+    # XML of a page, from its <page> line to its </page> line
+    def read_page(self, title):
+        position = self.find(title)
+        if position is None:
+            raise KeyError('{} is not in the page index'.format(title))
+        stream, offset, length = position
+        if self.dump_map is not None:
+            return self.dump_map[offset:offset + length]
+        self.dump.seek(stream, 0)
+        with self.dump.open() as f:
+            f.seek(offset)
+            data = f.read(length)
+        self.dump.raw.close()
+        return data
+
+    def get_lines(self, title):
+        return self.dump.split_lines(self.read_page(title).decode('utf-8'))
+
+    def close(self):
+        for m in (self.index, self.dump_map):
+            if isinstance(m, mmap.mmap):
+                m.close()
+        for f in self.files:
+            f.close()
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Index the pages of a dump, then read or parse any of them directly')
+    parser.add_argument('--dump', default='inputs/truncated_enwiktionary-20200820-pages-articles.xml',
+                        help='Path to the dump (.xml, .xml.bz2, .xml.gz or multistream .xml.bz2)')
+    parser.add_argument('--index', help='Index file of a multistream dump, if not next to the dump')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help='Build the page index next to the dump')
+    build_parser.add_argument('--workers', type=int, help='Processes decompressing a multistream dump')
+    xml_parser = subparsers.add_parser('xml', help='Print the XML of pages')
+    xml_parser.add_argument('titles', nargs='+')
+    rows_parser = subparsers.add_parser('rows', help='Print the output rows of pages')
+    rows_parser.add_argument('titles', nargs='+')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        print('{} pages'.format(build_page_index(args.dump, args.index, args.workers)))
+    elif args.command == 'xml':
+        with WiktionaryPages(args.dump, args.index) as dump_pages:
+            for page_title in args.titles:
+                print(dump_pages.read_page(page_title).decode('utf-8'), end='')
+    else:
+        from WiktionaryExtractor import WiktionaryExtractor
+        extractor = WiktionaryExtractor()
+        extractor.wiktionary_dump_filepath = args.dump
+        extractor.dump_index_filepath = args.index
+        extractor.page_titles = args.titles
+        for row in extractor.iter_rows():
+            print(','.join(row))
@@ -0,0 +1,872 @@
+# Generated by "python WiktionaryScripts.py --build" from the Unicode 14.0.0 database. Do not edit.
+UNICODE_VERSION = '14.0.0'
+SCRIPTS = (
+    'Latin',
+    'Common',
+    'Greek',
+    'Coptic',
+    'Cyrillic',
+    'Armenian',
+    'Hebrew',
+    'Arabic',
+    'Syriac',
+    'Thaana',
+    'Nko',
+    'Samaritan',
+    'Mandaic',
+    'Devanagari',
+    'Bengali',
+    'Gurmukhi',
+    'Gujarati',
+    'Oriya',
+    'Tamil',
+    'Telugu',
+    'Kannada',
+    'Malayalam',
+    'Sinhala',
+    'Thai',
+    'Lao',
+    'Tibetan',
+    'Myanmar',
+    'Georgian',
+    'Hangul',
+    'Ethiopic',
+    'Cherokee',
+    'Canadian_Syllabics',
+    'Ogham',
+    'Runic',
+    'Tagalog',
+    'Hanunoo',
+    'Buhid',
+    'Tagbanwa',
+    'Khmer',
+    'Mongolian',
+    'Limbu',
+    'Tai_Le',
+    'New_Tai_Lue',
+    'Buginese',
+    'Tai_Tham',
+    'Balinese',
+    'Sundanese',
+    'Batak',
+    'Lepcha',
+    'Ol_Chiki',
+    'Glagolitic',
+    'Tifinagh',
+    'Han',
+    'Hiragana',
+    'Katakana',
+    'Bopomofo',
+    'Yi',
+    'Lisu',
+    'Vai',
+    'Bamum',
+    'Syloti_Nagri',
+    'Phags_Pa',
+    'Saurashtra',
+    'Kayah_Li',
+    'Rejang',
+    'Javanese',
+    'Cham',
+    'Tai_Viet',
+    'Meetei_Mayek',
+    'Linear_B',
+    'Lycian',
+    'Carian',
+    'Old_Italic',
+    'Gothic',
+    'Old_Permic',
+    'Ugaritic',
+    'Old_Persian',
+    'Deseret',
+    'Shavian',
+    'Osmanya',
+    'Osage',
+    'Elbasan',
+    'Caucasian_Albanian',
+    'Vithkuqi',
+    'Linear_A',
+    'Cypriot',
+    'Imperial_Aramaic',
+    'Palmyrene',
+    'Nabataean',
+    'Hatran',
+    'Phoenician',
+    'Lydian',
+    'Meroitic',
+    'Kharoshthi',
+    'Old_South_Arabian',
+    'Old_North_Arabian',
+    'Manichaean',
+    'Avestan',
+    'Inscriptional_Parthian',
+    'Inscriptional_Pahlavi',
+    'Psalter_Pahlavi',
+    'Old_Turkic',
+    'Old_Hungarian',
+    'Hanifi_Rohingya',
+    'Yezidi',
+    'Old_Sogdian',
+    'Sogdian',
+    'Old_Uyghur',
+    'Chorasmian',
+    'Elymaic',
+    'Brahmi',
+    'Kaithi',
+    'Sora',
+    'Chakma',
+    'Mahajani',
+    'Sharada',
+    'Khojki',
+    'Multani',
+    'Khudawadi',
+    'Grantha',
+    'Newa',
+    'Tirhuta',
+    'Siddham',
+    'Modi',
+    'Takri',
+    'Ahom',
+    'Dogra',
+    'Warang_Citi',
+    'Dives_Akuru',
+    'Nandinagari',
+    'Zanabazar_Square',
+    'Soyombo',
+    'Pau_Cin_Hau',
+    'Bhaiksuki',
+    'Marchen',
+    'Masaram_Gondi',
+    'Gunjala_Gondi',
+    'Makasar',
+    'Cuneiform',
+    'Cypro_Minoan',
+    'Egyptian_Hieroglyphs',
+    'Anatolian_Hieroglyphs',
+    'Mro',
+    'Tangsa',
+    'Bassa_Vah',
+    'Pahawh_Hmong',
+    'Medefaidrin',
+    'Miao',
+    'Tangut',
+    'Nushu',
+    'Khitan_Small_Script',
+    'Duployan',
+    'Nyiakeng_Puachue_Hmong',
+    'Toto',
+    'Wancho',
+    'Mende_Kikakui',
+    'Adlam',
+)
+RANGES = (  # (first code point, last code point, index in SCRIPTS) of alphabetic characters
+    (0x0041, 0x005A, 0),
+    (0x0061, 0x007A, 0),
+    (0x00AA, 0x00AA, 1),
+    (0x00B5, 0x00B5, 1),
+    (0x00BA, 0x00BA, 1),
+    (0x00C0, 0x00D6, 0),
+    (0x00D8, 0x00F6, 0),
+    (0x00F8, 0x02AF, 0),
+    (0x02B0, 0x02C1, 1),
+    (0x02C6, 0x02D1, 1),
+    (0x02E0, 0x02E4, 1),
+    (0x02EC, 0x02EC, 1),
+    (0x02EE, 0x02EE, 1),
+    (0x0370, 0x0374, 2),
+    (0x0376, 0x0377, 2),
+    (0x037A, 0x037D, 2),
+    (0x037F, 0x037F, 2),
+    (0x0386, 0x0386, 2),
+    (0x0388, 0x038A, 2),
+    (0x038C, 0x038C, 2),
+    (0x038E, 0x03A1, 2),
+    (0x03A3, 0x03E1, 2),
+    (0x03E2, 0x03EF, 3),
+    (0x03F0, 0x03F5, 2),
+    (0x03F7, 0x03FF, 2),
+    (0x0400, 0x0481, 4),
+    (0x048A, 0x052F, 4),
+    (0x0531, 0x0556, 5),
+    (0x0559, 0x0559, 5),
+    (0x0560, 0x0588, 5),
+    (0x05D0, 0x05EA, 6),
+    (0x05EF, 0x05F2, 6),
+    (0x0620, 0x064A, 7),
+    (0x066E, 0x066F, 7),
+    (0x0671, 0x06D3, 7),
+    (0x06D5, 0x06D5, 7),
+    (0x06E5, 0x06E6, 7),
+    (0x06EE, 0x06EF, 7),
+    (0x06FA, 0x06FC, 7),
+    (0x06FF, 0x06FF, 7),
+    (0x0710, 0x0710, 8),
+    (0x0712, 0x072F, 8),
+    (0x074D, 0x074F, 8),
+    (0x0750, 0x077F, 7),
+    (0x0780, 0x07A5, 9),
+    (0x07B1, 0x07B1, 9),
+    (0x07CA, 0x07EA, 10),
+    (0x07F4, 0x07F5, 10),
+    (0x07FA, 0x07FA, 10),
+    (0x0800, 0x0815, 11),
+    (0x081A, 0x081A, 11),
+    (0x0824, 0x0824, 11),
+    (0x0828, 0x0828, 11),
+    (0x0840, 0x0858, 12),
+    (0x0860, 0x086A, 8),
+    (0x0870, 0x0887, 7),
+    (0x0889, 0x088E, 7),
+    (0x08A0, 0x08C9, 7),
+    (0x0904, 0x0939, 13),
+    (0x093D, 0x093D, 13),
+    (0x0950, 0x0950, 13),
+    (0x0958, 0x0961, 13),
+    (0x0971, 0x097F, 13),
+    (0x0980, 0x0980, 14),
+    (0x0985, 0x098C, 14),
+    (0x098F, 0x0990, 14),
+    (0x0993, 0x09A8, 14),
+    (0x09AA, 0x09B0, 14),
+    (0x09B2, 0x09B2, 14),
+    (0x09B6, 0x09B9, 14),
+    (0x09BD, 0x09BD, 14),
+    (0x09CE, 0x09CE, 14),
+    (0x09DC, 0x09DD, 14),
+    (0x09DF, 0x09E1, 14),
+    (0x09F0, 0x09F1, 14),
+    (0x09FC, 0x09FC, 14),
+    (0x0A05, 0x0A0A, 15),
+    (0x0A0F, 0x0A10, 15),
+    (0x0A13, 0x0A28, 15),
+    (0x0A2A, 0x0A30, 15),
+    (0x0A32, 0x0A33, 15),
+    (0x0A35, 0x0A36, 15),
+    (0x0A38, 0x0A39, 15),
+    (0x0A59, 0x0A5C, 15),
+    (0x0A5E, 0x0A5E, 15),
+    (0x0A72, 0x0A74, 15),
+    (0x0A85, 0x0A8D, 16),
+    (0x0A8F, 0x0A91, 16),
+    (0x0A93, 0x0AA8, 16),
+    (0x0AAA, 0x0AB0, 16),
+    (0x0AB2, 0x0AB3, 16),
+    (0x0AB5, 0x0AB9, 16),
+    (0x0ABD, 0x0ABD, 16),
+    (0x0AD0, 0x0AD0, 16),
+    (0x0AE0, 0x0AE1, 16),
+    (0x0AF9, 0x0AF9, 16),
+    (0x0B05, 0x0B0C, 17),
+    (0x0B0F, 0x0B10, 17),
+    (0x0B13, 0x0B28, 17),
+    (0x0B2A, 0x0B30, 17),
+    (0x0B32, 0x0B33, 17),
+    (0x0B35, 0x0B39, 17),
+    (0x0B3D, 0x0B3D, 17),
+    (0x0B5C, 0x0B5D, 17),
+    (0x0B5F, 0x0B61, 17),
+    (0x0B71, 0x0B71, 17),
+    (0x0B83, 0x0B83, 18),
+    (0x0B85, 0x0B8A, 18),
+    (0x0B8E, 0x0B90, 18),
+    (0x0B92, 0x0B95, 18),
+    (0x0B99, 0x0B9A, 18),
+    (0x0B9C, 0x0B9C, 18),
+    (0x0B9E, 0x0B9F, 18),
+    (0x0BA3, 0x0BA4, 18),
+    (0x0BA8, 0x0BAA, 18),
+    (0x0BAE, 0x0BB9, 18),
+    (0x0BD0, 0x0BD0, 18),
+    (0x0C05, 0x0C0C, 19),
+    (0x0C0E, 0x0C10, 19),
+    (0x0C12, 0x0C28, 19),
+    (0x0C2A, 0x0C39, 19),
+    (0x0C3D, 0x0C3D, 19),
+    (0x0C58, 0x0C5A, 19),
+    (0x0C5D, 0x0C5D, 19),
+    (0x0C60, 0x0C61, 19),
+    (0x0C80, 0x0C80, 20),
+    (0x0C85, 0x0C8C, 20),
+    (0x0C8E, 0x0C90, 20),
+    (0x0C92, 0x0CA8, 20),
+    (0x0CAA, 0x0CB3, 20),
+    (0x0CB5, 0x0CB9, 20),
+    (0x0CBD, 0x0CBD, 20),
+    (0x0CDD, 0x0CDE, 20),
+    (0x0CE0, 0x0CE1, 20),
+    (0x0CF1, 0x0CF2, 20),
+    (0x0D04, 0x0D0C, 21),
+    (0x0D0E, 0x0D10, 21),
+    (0x0D12, 0x0D3A, 21),
+    (0x0D3D, 0x0D3D, 21),
+    (0x0D4E, 0x0D4E, 21),
+    (0x0D54, 0x0D56, 21),
+    (0x0D5F, 0x0D61, 21),
+    (0x0D7A, 0x0D7F, 21),
+    (0x0D85, 0x0D96, 22),
+    (0x0D9A, 0x0DB1, 22),
+    (0x0DB3, 0x0DBB, 22),
+    (0x0DBD, 0x0DBD, 22),
+    (0x0DC0, 0x0DC6, 22),
+    (0x0E01, 0x0E30, 23),
+    (0x0E32, 0x0E33, 23),
+    (0x0E40, 0x0E46, 23),
+    (0x0E81, 0x0E82, 24),
+    (0x0E84, 0x0E84, 24),
+    (0x0E86, 0x0E8A, 24),
+    (0x0E8C, 0x0EA3, 24),
+    (0x0EA5, 0x0EA5, 24),
+    (0x0EA7, 0x0EB0, 24),
+    (0x0EB2, 0x0EB3, 24),
+    (0x0EBD, 0x0EBD, 24),
+    (0x0EC0, 0x0EC4, 24),
+    (0x0EC6, 0x0EC6, 24),
+    (0x0EDC, 0x0EDF, 24),
+    (0x0F00, 0x0F00, 25),
+    (0x0F40, 0x0F47, 25),
+    (0x0F49, 0x0F6C, 25),
+    (0x0F88, 0x0F8C, 25),
+    (0x1000, 0x102A, 26),
+    (0x103F, 0x103F, 26),
+    (0x1050, 0x1055, 26),
+    (0x105A, 0x105D, 26),
+    (0x1061, 0x1061, 26),
+    (0x1065, 0x1066, 26),
+    (0x106E, 0x1070, 26),
+    (0x1075, 0x1081, 26),
+    (0x108E, 0x108E, 26),
+    (0x10A0, 0x10C5, 27),
+    (0x10C7, 0x10C7, 27),
+    (0x10CD, 0x10CD, 27),
+    (0x10D0, 0x10FA, 27),
+    (0x10FC, 0x10FC, 1),
+    (0x10FD, 0x10FF, 27),
+    (0x1100, 0x11FF, 28),
+    (0x1200, 0x1248, 29),
+    (0x124A, 0x124D, 29),
+    (0x1250, 0x1256, 29),
+    (0x1258, 0x1258, 29),
+    (0x125A, 0x125D, 29),
+    (0x1260, 0x1288, 29),
+    (0x128A, 0x128D, 29),
+    (0x1290, 0x12B0, 29),
+    (0x12B2, 0x12B5, 29),
+    (0x12B8, 0x12BE, 29),
+    (0x12C0, 0x12C0, 29),
+    (0x12C2, 0x12C5, 29),
+    (0x12C8, 0x12D6, 29),
+    (0x12D8, 0x1310, 29),
+    (0x1312, 0x1315, 29),
+    (0x1318, 0x135A, 29),
+    (0x1380, 0x138F, 29),
+    (0x13A0, 0x13F5, 30),
+    (0x13F8, 0x13FD, 30),
+    (0x1401, 0x166C, 31),
+    (0x166F, 0x167F, 31),
+    (0x1681, 0x169A, 32),
+    (0x16A0, 0x16EA, 33),
+    (0x16F1, 0x16F8, 33),
+    (0x1700, 0x1711, 34),
+    (0x171F, 0x171F, 34),
+    (0x1720, 0x1731, 35),
+    (0x1740, 0x1751, 36),
+    (0x1760, 0x176C, 37),
+    (0x176E, 0x1770, 37),
+    (0x1780, 0x17B3, 38),
+    (0x17D7, 0x17D7, 38),
+    (0x17DC, 0x17DC, 38),
+    (0x1820, 0x1878, 39),
+    (0x1880, 0x1884, 39),
+    (0x1887, 0x18A8, 39),
+    (0x18AA, 0x18AA, 39),
+    (0x18B0, 0x18F5, 31),
+    (0x1900, 0x191E, 40),
+    (0x1950, 0x196D, 41),
+    (0x1970, 0x1974, 41),
+    (0x1980, 0x19AB, 42),
+    (0x19B0, 0x19C9, 42),
+    (0x1A00, 0x1A16, 43),
+    (0x1A20, 0x1A54, 44),
+    (0x1AA7, 0x1AA7, 44),
+    (0x1B05, 0x1B33, 45),
+    (0x1B45, 0x1B4C, 45),
+    (0x1B83, 0x1BA0, 46),
+    (0x1BAE, 0x1BAF, 46),
+    (0x1BBA, 0x1BBF, 46),
+    (0x1BC0, 0x1BE5, 47),
+    (0x1C00, 0x1C23, 48),
+    (0x1C4D, 0x1C4F, 48),
+    (0x1C5A, 0x1C7D, 49),
+    (0x1C80, 0x1C88, 4),
+    (0x1C90, 0x1CBA, 27),
+    (0x1CBD, 0x1CBF, 27),
+    (0x1CE9, 0x1CEC, 1),
+    (0x1CEE, 0x1CF3, 1),
+    (0x1CF5, 0x1CF6, 1),
+    (0x1CFA, 0x1CFA, 1),
+    (0x1D00, 0x1D25, 0),
+    (0x1D26, 0x1D2A, 2),
+    (0x1D2B, 0x1D2B, 4),
+    (0x1D2C, 0x1D61, 1),
+    (0x1D62, 0x1D65, 0),
+    (0x1D66, 0x1D6A, 2),
+    (0x1D6B, 0x1D77, 0),
+    (0x1D78, 0x1D78, 1),
+    (0x1D79, 0x1D9A, 0),
+    (0x1D9B, 0x1DBF, 1),
+    (0x1E00, 0x1EFF, 0),
+    (0x1F00, 0x1F15, 2),
+    (0x1F18, 0x1F1D, 2),
+    (0x1F20, 0x1F45, 2),
+    (0x1F48, 0x1F4D, 2),
+    (0x1F50, 0x1F57, 2),
+    (0x1F59, 0x1F59, 2),
+    (0x1F5B, 0x1F5B, 2),
+    (0x1F5D, 0x1F5D, 2),
+    (0x1F5F, 0x1F7D, 2),
+    (0x1F80, 0x1FB4, 2),
+    (0x1FB6, 0x1FBC, 2),
+    (0x1FBE, 0x1FBE, 2),
+    (0x1FC2, 0x1FC4, 2),
+    (0x1FC6, 0x1FCC, 2),
+    (0x1FD0, 0x1FD3, 2),
+    (0x1FD6, 0x1FDB, 2),
+    (0x1FE0, 0x1FEC, 2),
+    (0x1FF2, 0x1FF4, 2),
+    (0x1FF6, 0x1FFC, 2),
+    (0x2071, 0x2071, 0),
+    (0x207F, 0x207F, 0),
+    (0x2090, 0x209C, 0),
+    (0x2102, 0x2102, 1),
+    (0x2107, 0x2107, 1),
+    (0x210A, 0x2113, 1),
+    (0x2115, 0x2115, 1),
+    (0x2119, 0x211D, 1),
+    (0x2124, 0x2124, 1),
+    (0x2126, 0x2126, 1),
+    (0x2128, 0x2128, 1),
+    (0x212A, 0x212D, 1),
+    (0x212F, 0x2139, 1),
+    (0x213C, 0x213F, 1),
+    (0x2145, 0x2149, 1),
+    (0x214E, 0x214E, 1),
+    (0x2183, 0x2183, 1),
+    (0x2184, 0x2184, 0),
+    (0x2C00, 0x2C2D, 50),
+    (0x2C2E, 0x2C2E, 0),
+    (0x2C2F, 0x2C5D, 50),
+    (0x2C5E, 0x2C5E, 0),
+    (0x2C5F, 0x2C5F, 50),
+    (0x2C60, 0x2C7C, 0),
+    (0x2C7D, 0x2C7D, 1),
+    (0x2C7E, 0x2C7F, 0),
+    (0x2C80, 0x2CE4, 3),
+    (0x2CEB, 0x2CEE, 3),
+    (0x2CF2, 0x2CF3, 3),
+    (0x2D00, 0x2D25, 27),
+    (0x2D27, 0x2D27, 27),
+    (0x2D2D, 0x2D2D, 27),
+    (0x2D30, 0x2D67, 51),
+    (0x2D6F, 0x2D6F, 51),
+    (0x2D80, 0x2D96, 29),
+    (0x2DA0, 0x2DA6, 29),
+    (0x2DA8, 0x2DAE, 29),
+    (0x2DB0, 0x2DB6, 29),
+    (0x2DB8, 0x2DBE, 29),
+    (0x2DC0, 0x2DC6, 29),
+    (0x2DC8, 0x2DCE, 29),
+    (0x2DD0, 0x2DD6, 29),
+    (0x2DD8, 0x2DDE, 29),
+    (0x2E2F, 0x2E2F, 1),
+    (0x3005, 0x3006, 52),
+    (0x3031, 0x3035, 1),
+    (0x303B, 0x303C, 1),
+    (0x3041, 0x3096, 53),
+    (0x309D, 0x309F, 53),
+    (0x30A1, 0x30FA, 54),
+    (0x30FC, 0x30FC, 1),
+    (0x30FD, 0x30FF, 54),
+    (0x3105, 0x312F, 55),
+    (0x3131, 0x318E, 28),
+    (0x31A0, 0x31BF, 55),
+    (0x31F0, 0x31FF, 54),
+    (0x3400, 0x4DBF, 52),
+    (0x4E00, 0x9FFF, 52),
+    (0xA000, 0xA48C, 56),
+    (0xA4D0, 0xA4FD, 57),
+    (0xA500, 0xA60C, 58),
+    (0xA610, 0xA61F, 58),
+    (0xA62A, 0xA62B, 58),
+    (0xA640, 0xA66E, 4),
+    (0xA67F, 0xA69B, 4),
+    (0xA69C, 0xA69D, 1),
+    (0xA6A0, 0xA6E5, 59),
+    (0xA717, 0xA71F, 1),
+    (0xA722, 0xA76F, 0),
+    (0xA770, 0xA770, 1),
+    (0xA771, 0xA787, 0),
+    (0xA788, 0xA788, 1),
+    (0xA78B, 0xA7CA, 0),
+    (0xA7D0, 0xA7D1, 0),
+    (0xA7D3, 0xA7D3, 0),
+    (0xA7D5, 0xA7D9, 0),
+    (0xA7F2, 0xA7F4, 1),
+    (0xA7F5, 0xA7F7, 0),
+    (0xA7F8, 0xA7F9, 1),
+    (0xA7FA, 0xA7FF, 0),
+    (0xA800, 0xA801, 60),
+    (0xA803, 0xA805, 60),
+    (0xA807, 0xA80A, 60),
+    (0xA80C, 0xA822, 60),
+    (0xA840, 0xA873, 61),
+    (0xA882, 0xA8B3, 62),
+    (0xA8F2, 0xA8F7, 13),
+    (0xA8FB, 0xA8FB, 13),
+    (0xA8FD, 0xA8FE, 13),
+    (0xA90A, 0xA925, 63),
+    (0xA930, 0xA946, 64),
+    (0xA960, 0xA97C, 28),
+    (0xA984, 0xA9B2, 65),
+    (0xA9CF, 0xA9CF, 65),
+    (0xA9E0, 0xA9E4, 26),
+    (0xA9E6, 0xA9EF, 26),
+    (0xA9FA, 0xA9FE, 26),
+    (0xAA00, 0xAA28, 66),
+    (0xAA40, 0xAA42, 66),
+    (0xAA44, 0xAA4B, 66),
+    (0xAA60, 0xAA76, 26),
+    (0xAA7A, 0xAA7A, 26),
+    (0xAA7E, 0xAA7F, 26),
+    (0xAA80, 0xAAAF, 67),
+    (0xAAB1, 0xAAB1, 67),
+    (0xAAB5, 0xAAB6, 67),
+    (0xAAB9, 0xAABD, 67),
+    (0xAAC0, 0xAAC0, 67),
+    (0xAAC2, 0xAAC2, 67),
+    (0xAADB, 0xAADD, 67),
+    (0xAAE0, 0xAAEA, 68),
+    (0xAAF2, 0xAAF4, 68),
+    (0xAB01, 0xAB06, 29),
+    (0xAB09, 0xAB0E, 29),
+    (0xAB11, 0xAB16, 29),
+    (0xAB20, 0xAB26, 29),
+    (0xAB28, 0xAB2E, 29),
+    (0xAB30, 0xAB5A, 0),
+    (0xAB5C, 0xAB5F, 1),
+    (0xAB60, 0xAB64, 0),
+    (0xAB65, 0xAB65, 2),
+    (0xAB66, 0xAB68, 0),
+    (0xAB69, 0xAB69, 1),
+    (0xAB70, 0xABBF, 30),
+    (0xABC0, 0xABE2, 68),
+    (0xAC00, 0xD7A3, 28),
+    (0xD7B0, 0xD7C6, 28),
+    (0xD7CB, 0xD7FB, 28),
+    (0xF900, 0xFA6D, 52),
+    (0xFA70, 0xFAD9, 52),
+    (0xFB00, 0xFB06, 0),
+    (0xFB13, 0xFB17, 5),
+    (0xFB1D, 0xFB1D, 6),
+    (0xFB1F, 0xFB28, 6),
+    (0xFB2A, 0xFB36, 6),
+    (0xFB38, 0xFB3C, 6),
+    (0xFB3E, 0xFB3E, 6),
+    (0xFB40, 0xFB41, 6),
+    (0xFB43, 0xFB44, 6),
+    (0xFB46, 0xFB4F, 6),
+    (0xFB50, 0xFBB1, 7),
+    (0xFBD3, 0xFD3D, 7),
+    (0xFD50, 0xFD8F, 7),
+    (0xFD92, 0xFDC7, 7),
+    (0xFDF0, 0xFDFB, 7),
+    (0xFE70, 0xFE74, 7),
+    (0xFE76, 0xFEFC, 7),
+    (0xFF21, 0xFF3A, 0),
+    (0xFF41, 0xFF5A, 0),
+    (0xFF66, 0xFF6F, 54),
+    (0xFF70, 0xFF70, 1),
+    (0xFF71, 0xFF9F, 54),
+    (0xFFA0, 0xFFBE, 28),
+    (0xFFC2, 0xFFC7, 28),
+    (0xFFCA, 0xFFCF, 28),
+    (0xFFD2, 0xFFD7, 28),
+    (0xFFDA, 0xFFDC, 28),
+    (0x10000, 0x1000B, 69),
+    (0x1000D, 0x10026, 69),
+    (0x10028, 0x1003A, 69),
+    (0x1003C, 0x1003D, 69),
+    (0x1003F, 0x1004D, 69),
+    (0x10050, 0x1005D, 69),
+    (0x10080, 0x100FA, 69),
+    (0x10280, 0x1029C, 70),
+    (0x102A0, 0x102D0, 71),
+    (0x10300, 0x1031F, 72),
+    (0x1032D, 0x1032F, 72),
+    (0x10330, 0x10340, 73),
+    (0x10342, 0x10349, 73),
+    (0x10350, 0x10375, 74),
+    (0x10380, 0x1039D, 75),
+    (0x103A0, 0x103C3, 76),
+    (0x103C8, 0x103CF, 76),
+    (0x10400, 0x1044F, 77),
+    (0x10450, 0x1047F, 78),
+    (0x10480, 0x1049D, 79),
+    (0x104B0, 0x104D3, 80),
+    (0x104D8, 0x104FB, 80),
+    (0x10500, 0x10527, 81),
+    (0x10530, 0x10563, 82),
+    (0x10570, 0x1057A, 83),
+    (0x1057C, 0x1058A, 83),
+    (0x1058C, 0x10592, 83),
+    (0x10594, 0x10595, 83),
+    (0x10597, 0x105A1, 83),
+    (0x105A3, 0x105B1, 83),
+    (0x105B3, 0x105B9, 83),
+    (0x105BB, 0x105BC, 83),
+    (0x10600, 0x10736, 84),
+    (0x10740, 0x10755, 84),
+    (0x10760, 0x10767, 84),
+    (0x10780, 0x10785, 1),
+    (0x10787, 0x107B0, 1),
+    (0x107B2, 0x107BA, 1),
+    (0x10800, 0x10805, 85),
+    (0x10808, 0x10808, 85),
+    (0x1080A, 0x10835, 85),
+    (0x10837, 0x10838, 85),
+    (0x1083C, 0x1083C, 85),
+    (0x1083F, 0x1083F, 85),
+    (0x10840, 0x10855, 86),
+    (0x10860, 0x10876, 87),
+    (0x10880, 0x1089E, 88),
+    (0x108E0, 0x108F2, 89),
+    (0x108F4, 0x108F5, 89),
+    (0x10900, 0x10915, 90),
+    (0x10920, 0x10939, 91),
+    (0x10980, 0x109B7, 92),
+    (0x109BE, 0x109BF, 92),
+    (0x10A00, 0x10A00, 93),
+    (0x10A10, 0x10A13, 93),
+    (0x10A15, 0x10A17, 93),
+    (0x10A19, 0x10A35, 93),
+    (0x10A60, 0x10A7C, 94),
+    (0x10A80, 0x10A9C, 95),
+    (0x10AC0, 0x10AC7, 96),
+    (0x10AC9, 0x10AE4, 96),
+    (0x10B00, 0x10B35, 97),
+    (0x10B40, 0x10B55, 98),
+    (0x10B60, 0x10B72, 99),
+    (0x10B80, 0x10B91, 100),
+    (0x10C00, 0x10C48, 101),
+    (0x10C80, 0x10CB2, 102),
+    (0x10CC0, 0x10CF2, 102),
+    (0x10D00, 0x10D23, 103),
+    (0x10E80, 0x10EA9, 104),
+    (0x10EB0, 0x10EB1, 104),
+    (0x10F00, 0x10F1C, 105),
+    (0x10F27, 0x10F27, 105),
+    (0x10F30, 0x10F45, 106),
+    (0x10F70, 0x10F81, 107),
+    (0x10FB0, 0x10FC4, 108),
+    (0x10FE0, 0x10FF6, 109),
+    (0x11003, 0x11037, 110),
+    (0x11071, 0x11072, 110),
+    (0x11075, 0x11075, 110),
+    (0x11083, 0x110AF, 111),
+    (0x110D0, 0x110E8, 112),
+    (0x11103, 0x11126, 113),
+    (0x11144, 0x11144, 113),
+    (0x11147, 0x11147, 113),
+    (0x11150, 0x11172, 114),
+    (0x11176, 0x11176, 114),
+    (0x11183, 0x111B2, 115),
+    (0x111C1, 0x111C4, 115),
+    (0x111DA, 0x111DA, 115),
+    (0x111DC, 0x111DC, 115),
+    (0x11200, 0x11211, 116),
+    (0x11213, 0x1122B, 116),
+    (0x11280, 0x11286, 117),
+    (0x11288, 0x11288, 117),
+    (0x1128A, 0x1128D, 117),
+    (0x1128F, 0x1129D, 117),
+    (0x1129F, 0x112A8, 117),
+    (0x112B0, 0x112DE, 118),
+    (0x11305, 0x1130C, 119),
+    (0x1130F, 0x11310, 119),
+    (0x11313, 0x11328, 119),
+    (0x1132A, 0x11330, 119),
+    (0x11332, 0x11333, 119),
+    (0x11335, 0x11339, 119),
+    (0x1133D, 0x1133D, 119),
+    (0x11350, 0x11350, 119),
+    (0x1135D, 0x11361, 119),
+    (0x11400, 0x11434, 120),
+    (0x11447, 0x1144A, 120),
+    (0x1145F, 0x11461, 120),
+    (0x11480, 0x114AF, 121),
+    (0x114C4, 0x114C5, 121),
+    (0x114C7, 0x114C7, 121),
+    (0x11580, 0x115AE, 122),
+    (0x115D8, 0x115DB, 122),
+    (0x11600, 0x1162F, 123),
+    (0x11644, 0x11644, 123),
+    (0x11680, 0x116AA, 124),
+    (0x116B8, 0x116B8, 124),
+    (0x11700, 0x1171A, 125),
+    (0x11740, 0x11746, 125),
+    (0x11800, 0x1182B, 126),
+    (0x118A0, 0x118DF, 127),
+    (0x118FF, 0x118FF, 127),
+    (0x11900, 0x11906, 128),
+    (0x11909, 0x11909, 128),
+    (0x1190C, 0x11913, 128),
+    (0x11915, 0x11916, 128),
+    (0x11918, 0x1192F, 128),
+    (0x1193F, 0x1193F, 128),
+    (0x11941, 0x11941, 128),
+    (0x119A0, 0x119A7, 129),
+    (0x119AA, 0x119D0, 129),
+    (0x119E1, 0x119E1, 129),
+    (0x119E3, 0x119E3, 129),
+    (0x11A00, 0x11A00, 130),
+    (0x11A0B, 0x11A32, 130),
+    (0x11A3A, 0x11A3A, 130),
+    (0x11A50, 0x11A50, 131),
+    (0x11A5C, 0x11A89, 131),
+    (0x11A9D, 0x11A9D, 131),
+    (0x11AB0, 0x11ABF, 31),
+    (0x11AC0, 0x11AF8, 132),
+    (0x11C00, 0x11C08, 133),
+    (0x11C0A, 0x11C2E, 133),
+    (0x11C40, 0x11C40, 133),
+    (0x11C72, 0x11C8F, 134),
+    (0x11D00, 0x11D06, 135),
+    (0x11D08, 0x11D09, 135),
+    (0x11D0B, 0x11D30, 135),
+    (0x11D46, 0x11D46, 135),
+    (0x11D60, 0x11D65, 136),
+    (0x11D67, 0x11D68, 136),
+    (0x11D6A, 0x11D89, 136),
+    (0x11D98, 0x11D98, 136),
+    (0x11EE0, 0x11EF2, 137),
+    (0x11FB0, 0x11FB0, 57),
+    (0x12000, 0x12399, 138),
+    (0x12480, 0x12543, 138),
+    (0x12F90, 0x12FF0, 139),
+    (0x13000, 0x1342E, 140),
+    (0x14400, 0x14646, 141),
+    (0x16800, 0x16A38, 59),
+    (0x16A40, 0x16A5E, 142),
+    (0x16A70, 0x16ABE, 143),
+    (0x16AD0, 0x16AED, 144),
+    (0x16B00, 0x16B2F, 145),
+    (0x16B40, 0x16B43, 145),
+    (0x16B63, 0x16B77, 145),
+    (0x16B7D, 0x16B8F, 145),
+    (0x16E40, 0x16E7F, 146),
+    (0x16F00, 0x16F4A, 147),
+    (0x16F50, 0x16F50, 147),
+    (0x16F93, 0x16F9F, 147),
+    (0x16FE0, 0x16FE0, 148),
+    (0x16FE1, 0x16FE1, 149),
+    (0x16FE3, 0x16FE3, 52),
+    (0x17000, 0x187F7, 148),
+    (0x18800, 0x18AFF, 148),
+    (0x18B00, 0x18CD5, 150),
+    (0x18D00, 0x18D08, 148),
+    (0x1AFF0, 0x1AFF3, 54),
+    (0x1AFF5, 0x1AFFB, 54),
+    (0x1AFFD, 0x1AFFE, 54),
+    (0x1B000, 0x1B000, 54),
+    (0x1B001, 0x1B11F, 53),
+    (0x1B120, 0x1B122, 54),
+    (0x1B150, 0x1B152, 53),
+    (0x1B164, 0x1B167, 54),
+    (0x1B170, 0x1B2FB, 149),
+    (0x1BC00, 0x1BC6A, 151),
+    (0x1BC70, 0x1BC7C, 151),
+    (0x1BC80, 0x1BC88, 151),
+    (0x1BC90, 0x1BC99, 151),
+    (0x1D400, 0x1D454, 1),
+    (0x1D456, 0x1D49C, 1),
+    (0x1D49E, 0x1D49F, 1),
+    (0x1D4A2, 0x1D4A2, 1),
+    (0x1D4A5, 0x1D4A6, 1),
+    (0x1D4A9, 0x1D4AC, 1),
+    (0x1D4AE, 0x1D4B9, 1),
+    (0x1D4BB, 0x1D4BB, 1),
+    (0x1D4BD, 0x1D4C3, 1),
+    (0x1D4C5, 0x1D505, 1),
+    (0x1D507, 0x1D50A, 1),
+    (0x1D50D, 0x1D514, 1),
+    (0x1D516, 0x1D51C, 1),
+    (0x1D51E, 0x1D539, 1),
+    (0x1D53B, 0x1D53E, 1),
+    (0x1D540, 0x1D544, 1),
+    (0x1D546, 0x1D546, 1),
+    (0x1D54A, 0x1D550, 1),
+    (0x1D552, 0x1D6A5, 1),
+    (0x1D6A8, 0x1D6C0, 1),
+    (0x1D6C2, 0x1D6DA, 1),
+    (0x1D6DC, 0x1D6FA, 1),
+    (0x1D6FC, 0x1D714, 1),
+    (0x1D716, 0x1D734, 1),
+    (0x1D736, 0x1D74E, 1),
+    (0x1D750, 0x1D76E, 1),
+    (0x1D770, 0x1D788, 1),
+    (0x1D78A, 0x1D7A8, 1),
+    (0x1D7AA, 0x1D7C2, 1),
+    (0x1D7C4, 0x1D7CB, 1),
+    (0x1DF00, 0x1DF1E, 0),
+    (0x1E100, 0x1E12C, 152),
+    (0x1E137, 0x1E13D, 152),
+    (0x1E14E, 0x1E14E, 152),
+    (0x1E290, 0x1E2AD, 153),
+    (0x1E2C0, 0x1E2EB, 154),
+    (0x1E7E0, 0x1E7E6, 29),
+    (0x1E7E8, 0x1E7EB, 29),
+    (0x1E7ED, 0x1E7EE, 29),
+    (0x1E7F0, 0x1E7FE, 29),
+    (0x1E800, 0x1E8C4, 155),
+    (0x1E900, 0x1E943, 156),
+    (0x1E94B, 0x1E94B, 156),
+    (0x1EE00, 0x1EE03, 7),
+    (0x1EE05, 0x1EE1F, 7),
+    (0x1EE21, 0x1EE22, 7),
+    (0x1EE24, 0x1EE24, 7),
+    (0x1EE27, 0x1EE27, 7),
+    (0x1EE29, 0x1EE32, 7),
+    (0x1EE34, 0x1EE37, 7),
+    (0x1EE39, 0x1EE39, 7),
+    (0x1EE3B, 0x1EE3B, 7),
+    (0x1EE42, 0x1EE42, 7),
+    (0x1EE47, 0x1EE47, 7),
+    (0x1EE49, 0x1EE49, 7),
+    (0x1EE4B, 0x1EE4B, 7),
+    (0x1EE4D, 0x1EE4F, 7),
+    (0x1EE51, 0x1EE52, 7),
+    (0x1EE54, 0x1EE54, 7),
+    (0x1EE57, 0x1EE57, 7),
+    (0x1EE59, 0x1EE59, 7),
+    (0x1EE5B, 0x1EE5B, 7),
+    (0x1EE5D, 0x1EE5D, 7),
+    (0x1EE5F, 0x1EE5F, 7),
+    (0x1EE61, 0x1EE62, 7),
+    (0x1EE64, 0x1EE64, 7),
+    (0x1EE67, 0x1EE6A, 7),
+    (0x1EE6C, 0x1EE72, 7),
+    (0x1EE74, 0x1EE77, 7),
+    (0x1EE79, 0x1EE7C, 7),
+    (0x1EE7E, 0x1EE7E, 7),
+    (0x1EE80, 0x1EE89, 7),
+    (0x1EE8B, 0x1EE9B, 7),
+    (0x1EEA1, 0x1EEA3, 7),
+    (0x1EEA5, 0x1EEA9, 7),
+    (0x1EEAB, 0x1EEBB, 7),
+    (0x20000, 0x2A6DF, 52),
+    (0x2A700, 0x2B738, 52),
+    (0x2B740, 0x2B81D, 52),
+    (0x2B820, 0x2CEA1, 52),
+    (0x2CEB0, 0x2EBE0, 52),
+    (0x2F800, 0x2FA1D, 52),
+    (0x30000, 0x3134A, 52),
+)
@@ -0,0 +1,154 @@
+from bisect import bisect_right
+import argparse
+import re
+import sys
+import unicodedata as ud
+
+tables_fp = 'WiktionaryScriptTables.py'
+
+# First words of letter names that are not a script. Their letters are classified as Common.
+COMMON_PREFIXES = frozenset(['ALEF', 'ANGSTROM', 'BET', 'BLACK-LETTER', 'CARON', 'DALET', 'DOUBLE-STRUCK', 'EULER',
+                             'FEMININE', 'GIMEL', 'INFORMATION', 'KATAKANA-HIRAGANA', 'KELVIN', 'MASCULINE', 'MASU',
+                             'MATHEMATICAL', 'MICRO', 'MODIFIER', 'OHM', 'PLANCK', 'ROMAN', 'SCRIPT', 'SUPERSCRIPT',
+                             'TURNED', 'VEDIC', 'VERTICAL'])
+IGNORED_PREFIXES = frozenset(['FULLWIDTH', 'HALFWIDTH'])  # Forms of letters of another script
+HAN_PREFIXES = frozenset(['CJK', 'IDEOGRAPHIC'])
+# Scripts named by more than one word, longest first. 'OLD', 'TAI' and 'LINEAR' scripts always take two words.
+MULTI_WORD_SCRIPTS = ('OLD NORTH ARABIAN', 'OLD SOUTH ARABIAN', 'NEW TAI LUE', 'PAU CIN HAU', 'NYIAKENG PUACHUE HMONG',
+                      'CANADIAN SYLLABICS', 'CAUCASIAN ALBANIAN', 'DIVES AKURU', 'GUNJALA GONDI', 'HANIFI ROHINGYA',
+                      'IMPERIAL ARAMAIC', 'INSCRIPTIONAL PAHLAVI', 'INSCRIPTIONAL PARTHIAN', 'KAYAH LI',
+                      'KHITAN SMALL SCRIPT', 'MASARAM GONDI', 'MEETEI MAYEK', 'OL CHIKI', 'PAHAWH HMONG',
+                      'PSALTER PAHLAVI', 'SYLOTI NAGRI', 'WARANG CITI', 'ZANABAZAR SQUARE')
+TWO_WORD_PREFIXES = frozenset(['LINEAR', 'OLD', 'TAI'])
+# Names that differ from the first words of their letters
+RENAMED_SCRIPTS = {'Anatolian': 'Anatolian_Hieroglyphs', 'Bassa': 'Bassa_Vah', 'Cypro-Minoan': 'Cypro_Minoan',
+                   'Egyptian': 'Egyptian_Hieroglyphs', 'Hentaigana': 'Hiragana', 'Mende': 'Mende_Kikakui',
+                   'Old_Chinese': 'Han', 'Phags-Pa': 'Phags_Pa'}
+UNNAMED_SCRIPTS = ((0x17000, 0x18AFF, 'Tangut'), (0x18D00, 0x18D7F, 'Tangut'))  # Ideographs named by code point
+
+
+# Script of an alphabetic character, from its Unicode name, e.g. 'Latin', 'Greek', 'Han' or 'Old_Italic'. Any letter
+# with LATIN in its name is Latin, as romanizations have always been checked that way.
+def name_to_script(uchr):
+    name = ud.name(uchr, '')
+    if not len(name):
+        for start, end, script in UNNAMED_SCRIPTS:
+            if start <= ord(uchr) <= end:
+                return script
+        return 'Unknown'
+    if 'LATIN' in name:
+        return 'Latin'
+
+    words = name.split()
+    while words[0] in IGNORED_PREFIXES:
+        words = words[1:]
+    if words[0] in COMMON_PREFIXES:
+        return 'Common'
+    if words[0] in HAN_PREFIXES:
+        return 'Han'
+    name = ' '.join(words)
+    script = words[0].title()
+    for multi_word_script in MULTI_WORD_SCRIPTS:
+        if name.startswith(multi_word_script + ' '):
+            script = multi_word_script.title().replace(' ', '_')
+            break
+    else:
+        if words[0] in TWO_WORD_PREFIXES:
+            script = '_'.join(words[:2]).title()
+    return RENAMED_SCRIPTS.get(script, script)
+
+
+# Ranges of alphabetic code points as (first, last, script index), merging neighbouring letters of the same script
+def build_ranges():
+    scripts = []
+    ranges = []
+    for cp in range(sys.maxunicode + 1):
+        uchr = chr(cp)
+        if not uchr.isalpha():
+            continue
+        script = name_to_script(uchr)
+        if script not in scripts:
+            scripts.append(script)
+        idx = scripts.index(script)
+        if len(ranges) and ranges[-1][1] == cp - 1 and ranges[-1][2] == idx:
+            ranges[-1][1] = cp
+        else:
+            ranges.append([cp, cp, idx])
+    return scripts, ranges
+
+
+def write_tables(filepath=tables_fp):
+    scripts, ranges = build_ranges()
+    with open(filepath, 'w', encoding='utf-8', newline='\r\n') as f:
+        f.write('# Generated by "python WiktionaryScripts.py --build" from the Unicode {} database. Do not edit.\n'
+                .format(ud.unidata_version))
+        f.write("UNICODE_VERSION = '{}'\n".format(ud.unidata_version))
+        f.write('SCRIPTS = (\n')
+        for script in scripts:
+            f.write("    '{}',\n".format(script))
+        f.write(')\n')
+        f.write('RANGES = (  # (first code point, last code point, index in SCRIPTS) of alphabetic characters\n')
+        for first, last, idx in ranges:
+            f.write('    (0x{:04X}, 0x{:04X}, {}),\n'.format(first, last, idx))
+        f.write(')\n')
+    return len(scripts), len(ranges)
+
+
+try:
+    from WiktionaryScriptTables import RANGES, SCRIPTS, UNICODE_VERSION
+except ImportError:  # Tables not built yet: the same ranges straight from the Unicode database, which is slower
+    SCRIPTS, RANGES = build_ranges()
+    UNICODE_VERSION = ud.unidata_version
+
+range_starts = [r[0] for r in RANGES]
+ascii_letter_pattern = re.compile('[A-Za-z]')
+char_scripts = {}  # Shared by all entries; the number of distinct characters in a dump is small
+
+
+def get_char_script(uchr):
+    try:
+        return char_scripts[uchr]
+    except KeyError:
+        cp = ord(uchr)
+        i = bisect_right(range_starts, cp) - 1
+        script = SCRIPTS[RANGES[i][2]] if i >= 0 and cp <= RANGES[i][1] else ''  # '' for anything but letters
+        return char_scripts.setdefault(uchr, script)
+
+
+# Whether all letters of a string are Latin. ASCII strings, most of the romanizations, need no lookups.
+def only_roman_chars(string):
+    if string.isascii():
+        return True
+    for uchr in string:
+        script = get_char_script(uchr)
+        if len(script) and script != 'Latin':
+            return False
+    return True
+
+
+# Scripts of the letters of a word in order of appearance, joined with '+' (e.g. 'Han+Hiragana'), or '' if the word has
+# no letters
+def get_script(word):
+    if word.isascii():
+        return 'Latin' if ascii_letter_pattern.search(word) is not None else ''
+    scripts = []
+    for uchr in word:
+        script = get_char_script(uchr)
+        if len(script) and script not in scripts:
+            scripts.append(script)
+    return '+'.join(scripts)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Regenerate the script tables from the Unicode database of this '
+                                                 'Python, or print the scripts of some words')
+    parser.add_argument('--build', action='store_true', help='Rewrite {}'.format(tables_fp))
+    parser.add_argument('words', nargs='*', help='Words to classify')
+    args = parser.parse_args()
+
+    if args.build:
+        n_scripts, n_ranges = write_tables()
+        print('{} scripts in {} ranges (Unicode {}, was {})'.format(n_scripts, n_ranges, ud.unidata_version,
+                                                                    UNICODE_VERSION))
+    for w in args.words:
+        print('{}\t{}'.format(w, get_script(w)))
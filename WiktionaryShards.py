@@ -0,0 +1,191 @@
+from WiktionaryEntry import OUTPUT_COLUMNS
+from WiktionaryIndex import WORD_COLUMNS, get_key
+import argparse
+import heapq
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+import zlib
+
+LANG = OUTPUT_COLUMNS.index('lang')
+MANIFEST = 'manifest.json'
+
+
+# Output sink that splits rows by their lang column into one CSV file per language, or with buckets, into that many
+# files of hashed languages, under a directory. Every shard buffers its own rows and is appended to once buffer_size
+# rows are waiting; all shards are flushed when flush_interval seconds have passed. Files are only open while they are
+# written, so there can be more shards than open file handles. Existing shards of the directory are replaced.
+class WiktionaryShardedWriter(object):
+    def __init__(self, directory='outputs/shards', buffer_size=1000, flush_interval=10.0, buckets=None):
+        self.directory = directory
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.buckets = buckets
+        self.buffers = {}
+        self.shards = {}  # Shard name -> {'file', 'rows', 'bytes', 'languages'}; languages is a set until close()
+        self.last_flush = time.monotonic()
+        self.closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.get_manifest_filepath()):
+            for shard in load_manifest(directory)['shards'].values():
+                shard_fp = os.path.join(directory, shard['file'])
+                if os.path.exists(shard_fp):
+                    os.remove(shard_fp)
+            os.remove(self.get_manifest_filepath())
+
+    def get_manifest_filepath(self):
+        return os.path.join(self.directory, MANIFEST)
+
+    # e.g. 'ind' for per-language shards, 'bucket-007' with buckets
+    def get_shard(self, lang):
+        if self.buckets is not None:
+            return 'bucket-{:03d}'.format(zlib.crc32(lang.encode('utf-8')) % self.buckets)
+        return re.sub('[^A-Za-z0-9-]', '_', lang) or '_'
+
+    # Rows are lists of column strings, as returned by WiktionaryEntry.to_full_rows
+    def write_rows(self, rows):
+        for row in rows:
+            shard = self.get_shard(row[LANG])
+            if shard not in self.shards:
+                self.shards[shard] = {'file': shard + '.csv', 'rows': 0, 'bytes': 0, 'languages': set()}
+                self.buffers[shard] = []
+            self.shards[shard]['languages'].add(row[LANG])
+            buffer = self.buffers[shard]
+            buffer.append(','.join(row))
+            if len(buffer) >= self.buffer_size:
+                self.flush_shard(shard)
+        if time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    # Lines of comma-separated values, as written to the output CSV
+    def write(self, output_str):
+        if len(output_str):
+            self.write_rows([line.split(',') for line in output_str.split('\n')])
+
+    def flush_shard(self, shard):
+        buffer = self.buffers[shard]
+        if not len(buffer):
+            return
+        data = ('\n'.join(buffer) + '\n').encode('utf-8')
+        mode = 'ab' if self.shards[shard]['bytes'] else 'wb'  # Shards left by an interrupted run are overwritten
+        with open(os.path.join(self.directory, self.shards[shard]['file']), mode) as f:
+            f.write(data)
+        self.shards[shard]['rows'] += len(buffer)
+        self.shards[shard]['bytes'] += len(data)
+        self.buffers[shard] = []
+
+    def flush(self):
+        for shard in self.buffers:
+            self.flush_shard(shard)
+        self.last_flush = time.monotonic()
+
+    # Shards, with their row counts and sizes, are listed in the manifest once all rows are written
+    def close(self):
+        if self.closed:
+            return
+        self.flush()
+        for shard in self.shards.values():
+            shard['languages'] = sorted(shard['languages'])
+        manifest = {'columns': OUTPUT_COLUMNS, 'buckets': self.buckets,
+                    'shards': {shard: self.shards[shard] for shard in sorted(self.shards)}}
+        manifest_fp = self.get_manifest_filepath()
+        with open(manifest_fp + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(manifest_fp + '.tmp', manifest_fp)
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def load_manifest(directory):
+    with open(os.path.join(directory, MANIFEST), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+# Rows of one language, read from its shard only
+def iter_language_rows(directory, lang):
+    for shard in load_manifest(directory)['shards'].values():
+        if lang in shard['languages']:
+            with open(os.path.join(directory, shard['file']), 'r', encoding='utf-8') as f:
+                for line in f:
+                    row = line.rstrip('\n').split(',')
+                    if row[LANG] == lang:
+                        yield row
+
+
+def get_line_key(line):
+    return get_key(line, WORD_COLUMNS)
+
+
+# Worker process entry point: split a shard into runs of at most run_size lines, sorted on their (lang, word) key, and
+# return the paths of the run files
+def sort_shard(filepath, run_size, run_directory):
+    runs = []
+    with open(filepath, 'rb') as f:
+        while True:
+            lines = [line for _, line in zip(range(run_size), f)]
+            if not len(lines):
+                break
+            lines.sort(key=get_line_key)
+            with tempfile.NamedTemporaryFile('wb', dir=run_directory, suffix='.run', delete=False) as run:
+                run.writelines(lines)
+                runs.append(run.name)
+    return runs
+
+
+def merge_runs(runs, filepath):
+    files = [open(run, 'rb') for run in runs]
+    try:
+        with open(filepath, 'wb') as f:
+            f.writelines(heapq.merge(*files, key=get_line_key))
+    finally:
+        for run in files:
+            run.close()
+
+
+# k-way merge of all shards into one CSV file sorted by lang, then word, as WiktionaryIndex expects. Shards are sorted
+# in runs of run_size lines by a pool of worker processes, then merged max_files runs at a time. Rows with the same key
+# keep their dump order.
+def merge_shards(directory='outputs/shards', filepath='outputs/WiktionaryOutput.sorted.csv', run_size=1000000,
+                 max_files=64, workers=None):
+    manifest = load_manifest(directory)
+    shard_fps = [os.path.join(directory, shard['file']) for shard in manifest['shards'].values()]
+    with tempfile.TemporaryDirectory(dir=directory) as run_directory:
+        with multiprocessing.Pool(workers) as pool:
+            runs = [run for shard_runs in pool.starmap(sort_shard, [(fp, run_size, run_directory) for fp in shard_fps])
+                    for run in shard_runs]
+        while len(runs) > max_files:
+            merged = []
+            for i in range(0, len(runs), max_files):
+                with tempfile.NamedTemporaryFile('wb', dir=run_directory, suffix='.run', delete=False) as run:
+                    merged.append(run.name)
+                merge_runs(runs[i:i + max_files], merged[-1])
+            runs = merged
+        merge_runs(runs, filepath)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Merge or read the sharded output of WiktionaryExtractor.py --shards')
+    parser.add_argument('--shards', default='outputs/shards', help='Directory of the shards and their manifest')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    merge_parser = subparsers.add_parser('merge', help='Merge all shards into one CSV file sorted by lang and word')
+    merge_parser.add_argument('--output', default='outputs/WiktionaryOutput.sorted.csv', help='Path of the CSV file')
+    merge_parser.add_argument('--run-size', type=int, default=1000000, help='Lines sorted in memory at a time')
+    merge_parser.add_argument('--workers', type=int, help='Number of worker processes sorting shards')
+    lang_parser = subparsers.add_parser('lang', help='Print the rows of one language')
+    lang_parser.add_argument('lang')
+    args = parser.parse_args()
+
+    if args.command == 'merge':
+        merge_shards(args.shards, args.output, args.run_size, workers=args.workers)
+    else:
+        for language_row in iter_language_rows(args.shards, args.lang):
+            print(','.join(language_row))
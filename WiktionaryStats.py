@@ -0,0 +1,78 @@
+import json
+import sys
+import time
+
+COUNTERS = ('bytes_read', 'lines_read', 'pages', 'pages_skipped_namespace', 'sections_saved', 'rows_emitted')
+# Seconds; parse, merge and format are summed over worker processes. read_wait is the time spent waiting for the dump
+# to be read ahead, see WiktionaryDump.read_ahead.
+TIMERS = ('parse', 'merge', 'format', 'write', 'read_wait')
+
+
+# Counters and stage timers of one extraction run. The extractor only keeps a WiktionaryStats when instrumentation is
+# enabled and checks for None everywhere else, so an uninstrumented run does no extra work per line.
+class WiktionaryStats(object):
+    def __init__(self, total_bytes=None, interval=10.0, check_lines=10000, out=sys.stderr):
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.timers = dict.fromkeys(TIMERS, 0.0)
+        self.total_bytes = total_bytes  # Size of the dump on disk, for the ETA
+        self.interval = interval  # Seconds between progress lines; None disables them
+        self.check_lines = check_lines  # The clock is only read every check_lines lines
+        self.out = out
+        self.start = time.monotonic()
+        self.last_progress = self.start
+
+    def add_timings(self, timings):
+        for name, seconds in timings.items():
+            self.timers[name] += seconds
+
+    # Wraps the lines of a WiktionaryDump, counting them and reading its offset and page counts every check_lines
+    # lines. Lines of skipped pages are never split, so they are not counted.
+    def iter_lines(self, dump):
+        lines = 0
+        for line in dump:
+            yield line
+            lines += 1
+            if lines % self.check_lines == 0:
+                self.counters['lines_read'] = lines
+                self.update(dump)
+        self.counters['lines_read'] = lines
+        self.update(dump)
+
+    def update(self, dump):
+        self.counters['bytes_read'] = dump.tell()
+        self.counters['pages'] = dump.pages
+        self.counters['pages_skipped_namespace'] = dump.skipped_pages
+        self.timers['read_wait'] = dump.read_wait
+        now = time.monotonic()
+        if self.interval is not None and now - self.last_progress >= self.interval:
+            self.last_progress = now
+            print(self.get_progress(), file=self.out, flush=True)
+
+    # e.g. "12.5% 1.2/9.6 GB, 401234 pages (3456/s), 987654 rows (8765/s), 10.2 MB/s, ETA 0:13:37"
+    def get_progress(self):
+        elapsed = max(time.monotonic() - self.start, 1e-9)
+        done = self.counters['bytes_read']
+        progress = '{:.2f} GB'.format(done / 2 ** 30)
+        eta = ''
+        if self.total_bytes:
+            progress = '{:.1%} {:.2f}/{:.2f} GB'.format(done / self.total_bytes, done / 2 ** 30,
+                                                      self.total_bytes / 2 ** 30)
+            if done:
+                remaining = int(elapsed * (self.total_bytes - done) / done)
+                eta = ', ETA {}:{:02d}:{:02d}'.format(remaining // 3600, remaining // 60 % 60, remaining % 60)
+        return '{}, {} pages ({:.0f}/s), {} rows ({:.0f}/s), {:.1f} MB/s{}'.format(
+            progress, self.counters['pages'], self.counters['pages'] / elapsed, self.counters['rows_emitted'],
+            self.counters['rows_emitted'] / elapsed, done / 2 ** 20 / elapsed, eta)
+
+    def report(self):
+        elapsed = time.monotonic() - self.start
+        return {'elapsed': round(elapsed, 3),
+                'counters': dict(self.counters),
+                'timers': {name: round(seconds, 3) for name, seconds in self.timers.items()},
+                'pages_per_sec': round(self.counters['pages'] / elapsed, 1) if elapsed else 0.0,
+                'rows_per_sec': round(self.counters['rows_emitted'] / elapsed, 1) if elapsed else 0.0,
+                'bytes_per_sec': round(self.counters['bytes_read'] / elapsed, 1) if elapsed else 0.0}
+
+    def save(self, filepath):
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
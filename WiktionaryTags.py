@@ -1,8 +1,30 @@
 from collections import defaultdict
+import argparse
+import marshal
+import os
+import sys
+
+iso_fp = 'inputs/ISO Language Codes.csv'
+pos_fp = 'inputs/parts_of_speech.txt'
+# Compiled tag tables, rebuilt whenever one of source_fps (or this Python) changes
+cache_fp = 'inputs/WiktionaryTags.cache'
+source_fps = (iso_fp, pos_fp, os.path.abspath(__file__))
+TABLES = ('iso2lang', 'lang2iso', 'POS', 'save_ety_tags', 'skip_ety_tags', 'nonstandard2standard')
+
+_shared_tags = None
 
 
 class WiktionaryTags(object):
-    def __init__(self):
+    # With a cache_fp, the tables are loaded from the compiled cache, which is built on first use; None always parses
+    # the source files
+    def __init__(self, cache_fp=cache_fp):
+        if cache_fp is not None and self.load_cache(cache_fp):
+            return
+        self.load_sources()
+        if cache_fp is not None:
+            self.save_cache(cache_fp)
+
+    def load_sources(self):
         self.iso2lang = {}
         self.lang2iso = {}
         self.POS = set()
@@ -30,7 +52,6 @@ class WiktionaryTags(object):
         self.load_pos()
 
     def load_iso(self):
-        iso_fp = 'inputs/ISO Language Codes.csv'
         with open(iso_fp, 'r', encoding='utf-8') as f:
             lines = f.read().splitlines()
             for line in lines[1:]:
@@ -42,7 +63,64 @@ class WiktionaryTags(object):
                 self.lang2iso[lang] = iso3
 
     def load_pos(self):
-        pos_fp = 'inputs/parts_of_speech.txt'
         with open(pos_fp, 'r', encoding='utf-8') as f:
             for line in f:
                 self.POS.add(line.strip())
+
+    # False when the cache is missing, unreadable or older than its sources
+    def load_cache(self, filepath):
+        try:
+            with open(filepath, 'rb') as f:
+                key, tables = marshal.loads(f.read())  # marshal.load reads the file a few bytes at a time
+        except (OSError, EOFError, ValueError, TypeError):
+            return False
+        if key != get_cache_key():
+            return False
+        for name in TABLES:
+            setattr(self, name, tables[name])
+        self.nonstandard2standard = defaultdict(str, self.nonstandard2standard)
+        return True
+
+    # marshal only holds built-in types: nonstandard2standard is saved as a plain dict. A cache that cannot be written
+    # (e.g. read-only inputs) is skipped.
+    def save_cache(self, filepath):
+        tables = {name: getattr(self, name) for name in TABLES}
+        tables['nonstandard2standard'] = dict(self.nonstandard2standard)
+        try:
+            with open(filepath + '.tmp', 'wb') as f:
+                marshal.dump((get_cache_key(), tables), f)
+            os.replace(filepath + '.tmp', filepath)
+        except OSError:
+            pass
+
+
+# Modification time and size of every source, and the Python version, as marshal's format can change between versions
+def get_cache_key():
+    key = [sys.version]
+    for filepath in source_fps:
+        try:
+            stat = os.stat(filepath)
+            key.append((filepath, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            key.append((filepath, None, None))
+    return key
+
+
+# Return the process-wide tag registry, loading it on first use. Forked worker processes inherit the loaded copy, so
+# the input files are only read once. The registry is shared by reference and must be treated as read-only.
+def get_tags():
+    global _shared_tags
+    if _shared_tags is None:
+        _shared_tags = WiktionaryTags()
+    return _shared_tags
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compile the ISO codes, parts of speech and etymology tags into the '
+                                                 'tag cache loaded by the extractor')
+    parser.add_argument('--cache', default=cache_fp, help='Path of the compiled cache')
+    args = parser.parse_args()
+
+    tags = WiktionaryTags(None)
+    tags.save_cache(args.cache)
+    print('{} languages, {} parts of speech -> {}'.format(len(tags.iso2lang), len(tags.POS), args.cache))
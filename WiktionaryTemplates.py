@@ -0,0 +1,218 @@
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+from itertools import accumulate
+
+# Delimiters of template markup. Matching left to right pairs up '{{' and '}}' the same way a character-by-character
+# scan does, so a template body, or a value after 'key=', always starts on a delimiter boundary of the whole line.
+DELIMITERS = re.compile(r'(\{\{|\}\}|[|+()])')
+
+
+# Parses the templates of a line with a single scan for delimiters. Every later step jumps between the delimiter
+# positions found by that scan instead of walking the line again. Produces nested lists: [[key, value], ...] per
+# template, a list of those for compounds joined with '+', and [key, [[arg, ...], ...]] for a value that itself holds
+# templates.
+class TemplateTokenizer(object):
+    __slots__ = ('line', 'positions', 'delimiters')
+
+    def __init__(self, line):
+        self.line = line
+        parts = DELIMITERS.split(line)  # Text and delimiters alternate
+        self.delimiters = parts[1::2]
+        self.positions = list(accumulate(map(len, parts)))[0:-1:2]
+
+    # Delimiters inside line[start:end]. The last character of a span is never read as a delimiter.
+    def span(self, start, end):
+        lo = bisect_left(self.positions, start)
+        hi = bisect_left(self.positions, end - 1, lo)
+        return range(lo, hi)
+
+    # Bodies of the top-level templates in line[start:end], as (start, end) spans. Text in parentheses is skipped and
+    # a template after a '+' is grouped with the previous one as a compound.
+    def get_curly_braces(self, start, end):
+        sections = []
+
+        compound_flag = False
+        paren_flag = False
+        start_idx = None
+        depth = 0
+        for k in self.span(start, end):
+            delimiter = self.delimiters[k]
+            if delimiter == '(':
+                paren_flag = True
+            elif paren_flag:
+                if delimiter == ')':
+                    paren_flag = False
+            elif delimiter == '{{':
+                if depth == 0:
+                    start_idx = self.positions[k] + 2
+                depth += 1
+            elif delimiter == '}}':
+                depth -= 1
+                if depth == 0:
+                    body = (start_idx, self.positions[k])
+                    if compound_flag:
+                        if len(sections):
+                            if type(sections[-1]) is not list:
+                                sections[-1] = [sections[-1]]
+                            sections[-1].append(body)
+                        compound_flag = False
+                    else:
+                        sections.append(body)
+            elif delimiter == '+' and depth == 0:  # Compound
+                compound_flag = True
+
+        return sections
+
+    # Spans of the '|'-separated arguments of line[start:end], ignoring pipes inside nested templates
+    def separate_pipes(self, start, end):
+        sections = []
+
+        start_idx = start
+        depth = 0
+        for k in self.span(start, end):
+            delimiter = self.delimiters[k]
+            if delimiter == '{{':
+                depth += 1
+            elif delimiter == '}}':
+                depth -= 1
+            elif delimiter == '|' and depth == 0:
+                sections.append((start_idx, self.positions[k]))
+                start_idx = self.positions[k] + 1
+
+        sections.append((start_idx, end))
+        return sections
+
+    def get_strings(self, spans):
+        return [self.line[start:end] for start, end in spans]
+
+    # A key is a run of letters followed by '='. Returns the key and where the value starts.
+    def split_key(self, start, end):
+        eq = self.line.find('=', start, end)
+        if eq == start or (eq > start and self.line[start:eq].isalpha()):
+            return self.line[start:eq], eq + 1
+        return '', start
+
+    @staticmethod
+    def get_base_list(l):
+        if len(l) == 1 and type(l[0]) is list:
+            return TemplateTokenizer.get_base_list(l[0])
+        return l
+
+    def process_sub_braces(self, start, end):
+        sub = []
+        for child_start, child_end in self.separate_pipes(start, end):
+            key, val_start = self.split_key(child_start, child_end)
+            e_child = []
+            if self.line.find('{{', val_start, child_end) >= 0:
+                e_child = self.get_curly_braces(val_start, child_end)
+            if len(e_child):
+                dub_sub = []
+                for e_c in self.get_base_list(e_child):
+                    if type(e_c) is list:  # A compound alongside other templates is kept whole
+                        dub_sub.append(separate_item_pipes(self.get_strings(e_c)))
+                    else:
+                        dub_sub.append(self.get_strings(self.separate_pipes(*e_c)))
+                sub.append([key, dub_sub])
+            else:
+                sub.append([key, self.line[val_start:child_end]])
+        return sub
+
+    def get_all_braces(self):
+        output = []
+        for e in self.get_curly_braces(0, len(self.line)):
+            if type(e) is list:
+                sub = []
+                for cmp_start, cmp_end in e:
+                    sub.append(self.process_sub_braces(cmp_start, cmp_end))
+            else:
+                sub = self.process_sub_braces(*e)
+            output.append(sub)
+        return output
+
+
+def parse_templates(line):
+    return TemplateTokenizer(line).get_all_braces()
+
+
+# Nested lists to nested tuples, so that a parse tree can be shared without being mutated
+def freeze(tree):
+    if type(tree) is list:
+        return tuple([freeze(node) for node in tree])
+    return tree
+
+
+# Least-recently-used cache of parse trees keyed on the raw line. Etymology and pronunciation lines repeat across many
+# entries (inflected forms, {{IPA|...}} boilerplate), so most lines only need to be parsed once per process.
+class TemplateCache(object):
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize  # 0 disables caching
+        self.trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, line):
+        tree = self.trees.get(line)
+        if tree is not None:
+            self.hits += 1
+            self.trees.move_to_end(line)
+            return tree
+
+        self.misses += 1
+        tree = freeze(parse_templates(line))
+        if self.maxsize > 0:
+            self.trees[line] = tree
+            if len(self.trees) > self.maxsize:
+                self.trees.popitem(last=False)
+                self.evictions += 1
+        return tree
+
+    def resize(self, maxsize):
+        self.maxsize = maxsize
+        while len(self.trees) > max(maxsize, 0):
+            self.trees.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.trees.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {'size': len(self.trees), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'hit_rate': self.hits / lookups if lookups else 0.0}
+
+
+# Shared by every WiktionaryEntry in the process
+template_cache = TemplateCache()
+
+
+def parse_templates_cached(line):
+    return template_cache.get(line)
+
+
+# Pipe splitting over a list of template bodies rather than a string, matching the character scan when it is handed a
+# compound: list items are compared against the delimiters one at a time
+def separate_item_pipes(items):
+    sections = []
+
+    start_idx = 0
+    depth = 0
+    i = 0
+    while i + 1 < len(items):
+        if items[i] == '{' and items[i+1] == '{':
+            depth += 1
+            i += 1
+        elif items[i] == '}' and items[i+1] == '}':
+            depth -= 1
+            i += 1
+        elif items[i] == '|' and depth == 0:
+            sections.append(items[start_idx:i])
+            start_idx = i + 1
+        i += 1
+
+    sections.append(items[start_idx:])
+    return sections
@@ -0,0 +1,52 @@
+import os
+import time
+
+
+# Output sink that keeps one handle open for a whole run. Entries are buffered and written together once buffer_size
+# entries are waiting or flush_interval seconds have passed since the last write. Entries are encoded as they arrive,
+# so position always holds the byte offset in the file where the next entry will start.
+class WiktionaryWriter(object):
+    def __init__(self, filepath='outputs/WiktionaryOutput.csv', buffer_size=1000, flush_interval=10.0, mode='a'):
+        self.filepath = filepath
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.file = open(filepath, mode + 'b')
+        self.position = self.file.seek(0, os.SEEK_END)
+
+    def write(self, output_str):
+        if len(output_str):
+            self.write_bytes((output_str + '\n').encode('utf-8'))
+
+    # Rows are lists of column strings, as returned by WiktionaryEntry.to_full_rows
+    def write_rows(self, rows):
+        self.write('\n'.join([','.join(row) for row in rows]))
+
+    # Already encoded lines, e.g. copied from an earlier output file
+    def write_bytes(self, data):
+        if not len(data):
+            return
+        self.buffer.append(data)
+        self.position += len(data)
+        if len(self.buffer) >= self.buffer_size or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        if len(self.buffer):
+            self.file.write(b''.join(self.buffer))
+            self.buffer = []
+        self.file.flush()
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
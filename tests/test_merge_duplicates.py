@@ -0,0 +1,89 @@
+import copy
+import os
+
+import pytest
+
+from WiktionaryEntry import WiktionaryEntry
+from WiktionaryExtractor import WiktionaryExtractor
+from WiktionaryTags import WiktionaryTags
+
+pages_fp = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'pages.xml')
+# The languages of tests/data/pages.xml and the homographs below, so the tests run without the files in inputs/
+ISO_CODES = ['en,eng,English', 'fr,fra,French', 'la,lat,Latin', 'nl,nld,Dutch', 'jv,jav,Javanese',
+             'grc,grc,Ancient Greek', ',ang,Old English', ',enm,Middle English', ',gem-pro,Proto-Germanic',
+             ',ine-pro,Proto-Indo-European', ',itc-pro,Proto-Italic', ',map-pro,Proto-Austronesian',
+             ',poz-pro,Proto-Malayo-Polynesian']
+PARTS_OF_SPEECH = ['Noun', 'Verb', 'Adjective']
+
+
+@pytest.fixture
+def tags(tmp_path, monkeypatch):
+    iso_fp = tmp_path / 'iso.csv'
+    iso_fp.write_text('\n'.join(['ISO 639-1,ISO 639-2,Language'] + ISO_CODES), encoding='utf-8')
+    pos_fp = tmp_path / 'pos.txt'
+    pos_fp.write_text('\n'.join(PARTS_OF_SPEECH), encoding='utf-8')
+    monkeypatch.setattr('WiktionaryTags.iso_fp', str(iso_fp))
+    monkeypatch.setattr('WiktionaryTags.pos_fp', str(pos_fp))
+    stub_tags = WiktionaryTags(None)
+    monkeypatch.setattr('WiktionaryTags._shared_tags', stub_tags)  # Also returned by get_tags, e.g. to the extractor
+    return stub_tags
+
+
+# check_list_duplicates as it was before rows were bucketed: every pair of rows is compared, and passes are repeated
+# until nothing is merged
+def legacy_check_list_duplicates(entry, full_list):
+    while True:
+        temp_list = []
+        merged_idxs = []
+        for i, l1 in enumerate(full_list):
+            for j, l2 in enumerate(full_list):
+                if i >= j or i in merged_idxs or j in merged_idxs:
+                    continue
+                if entry.are_duplicates(l1, l2):
+                    temp_list.append(entry.combine_duplicates(l1, l2))
+                    merged_idxs.append(i)
+                    merged_idxs.append(j)
+
+        for k, l in enumerate(full_list):
+            if k not in merged_idxs:
+                temp_list.append(l)
+
+        if len(temp_list) == len(full_list):
+            break
+        full_list = temp_list
+
+    return full_list
+
+
+def iter_dump_entries(dump_fp):
+    extractor = WiktionaryExtractor()
+    extractor.wiktionary_dump_filepath = dump_fp
+    extractor.content_namespaces_only = False
+    extractor.workers = 1
+    yield from extractor.iter_entries()
+
+
+# Pages of the sample dump with several etymologies per language
+def test_same_rows_as_legacy_on_dump_pages(tags):
+    entries = 0
+    merged = 0
+    for entry in iter_dump_entries(pages_fp):
+        full_list = entry.to_full_list()
+        expected = legacy_check_list_duplicates(entry, copy.deepcopy(full_list))
+        assert entry.check_list_duplicates(copy.deepcopy(full_list)) == expected, entry.word
+        entries += 1
+        merged += len(full_list) - len(expected)
+    assert entries > 0
+    assert merged > 0  # The pages exercise the merging, not only lists without duplicates
+
+
+def test_same_rows_as_legacy_on_homographs(tags):
+    text = ['==Latin==', '===Etymology 1===', 'From {{inh|la|itc-pro|*alas}}, from {{inh|la|ine-pro|*h₂el-}}.',
+            '====Noun====', '# a', '===Etymology 2===', 'From {{bor|la|grc|ἅλς}}, {{der|la|ine-pro|*séh₂ls}}.',
+            'Cognate with {{cog|grc|ἅλς}} and {{cog|en|salt}}.', '====Verb====', '# b',
+            '===Etymology 3===', 'From {{der|la|itc-pro|*alas}} + {{der|la|itc-pro|-}}.', '====Noun====', '# c']
+    entry = WiktionaryEntry('ala', text, tags=tags)
+    full_list = entry.to_full_list()
+    result = entry.check_list_duplicates(copy.deepcopy(full_list))
+    assert result == legacy_check_list_duplicates(entry, copy.deepcopy(full_list))
+    assert len(result) < len(full_list)
@@ -0,0 +1,102 @@
+import itertools
+import re
+
+import pytest
+
+from WiktionaryNormalize import (normalize_roman, normalize_src_word, normalize_tr, normalize_word,
+                                 strip_brackets_parens)
+
+SRC_WORDS = [
+    ('alas', ['alas']),
+    ('foo bar', ['foo+bar']),
+    ('  foo \t bar  ', ['foo+bar']),  # Runs of whitespace, stripped at both ends
+    ('東京 都', ['東京+都']),
+    ('baz (qux)', ['baz']),  # Parenthesised text is dropped
+    ('(qux) baz', ['baz']),
+    ('a(b', ['a(b']),  # An unclosed parenthesis is kept
+    ('[[kantor]]', ['kantor']),  # Brackets are dropped, their text kept
+    ('[[foo]] (bar) [[baz]]', ['foo+baz']),
+    ('a, b', ['a', 'b']),  # Split in two at the first ', '
+    ('x (y, z), w', ['x ', 'w']),  # Parentheses are dropped before splitting; the halves are not stripped
+    ('a,b', ['a,b']),
+    ('', ['']),
+]
+TRS = [
+    ('alas', 'alas'),
+    ('[[alas]]', 'alas'),
+    ('a<sub>1</sub>', 'a'),
+    ('a<sup>2</sup>.b', 'ab'),  # A superscript takes the period after it
+    ('a&lt;sub&gt;1&lt;/sub&gt;', 'a'),  # HTML-escaped, as in the dump
+    ('x&lt;sup&gt;ii&lt;/sup&gt;.', 'x'),
+    ('<sub><sub>1</sub></sub>', '<sub></sub>'),  # Nested markup: each pattern is applied once, as before
+    ('a <b>', 'a <b>'),
+    ('&amp;', '&amp;'),
+]
+WORDS = [
+    ('Reconstruction:Latin/alas', '*alas'),
+    ('Reconstruction:Old English/x', '*x'),
+    ('Reconstruction:Proto-Germanic/w1', 'Reconstruction:Proto-Germanic/w1'),  # '-' is not matched by [\w ]
+    ('alas', 'alas'),
+    ('Template:x/y', 'Template:x/y'),
+]
+
+
+# The normalization before WiktionaryNormalize: a chain of re.sub calls, as WiktionaryEntry used to run them
+def legacy_src_word(src_word):
+    src_word = re.sub(r'\([^)]*\)', '', src_word)
+    src_word = re.sub(r'\[', '', src_word)
+    src_word = re.sub(r']', '', src_word)
+    splits = re.search(', ', src_word)
+    if splits is not None:
+        return [src_word[:splits.start()], src_word[splits.end():]]
+    return [re.sub(r'\s+', '+', src_word.strip())]
+
+
+def legacy_tr(string):
+    processed = re.sub(r'[\[\]]', '', string)
+    processed = re.sub(r'<sub>\w*</sub>', '', processed)
+    processed = re.sub(r'<sup>\w*</sup>\.?', '', processed)
+    processed = re.sub(r'&lt;sub&gt;\w*&lt;/sub&gt;', '', processed)
+    return re.sub(r'&lt;sup&gt;\w*&lt;/sup&gt;\.?', '', processed)
+
+
+def legacy_word(word):
+    return re.sub(r'^Reconstruction:[\w ]+/', '*', word)
+
+
+@pytest.mark.parametrize('src_word,expected', SRC_WORDS)
+def test_normalize_src_word(src_word, expected):
+    assert normalize_src_word(src_word) == expected
+    assert legacy_src_word(src_word) == expected
+
+
+@pytest.mark.parametrize('string,expected', TRS)
+def test_normalize_tr(string, expected):
+    assert normalize_tr(string) == expected
+    assert legacy_tr(string) == expected
+
+
+@pytest.mark.parametrize('word,expected', WORDS)
+def test_normalize_word(word, expected):
+    assert normalize_word(word) == expected
+    assert legacy_word(word) == expected
+
+
+def test_normalize_roman():
+    assert normalize_roman('Dong Kinh') == 'Dong+Kinh'
+    assert normalize_roman('alas') == 'alas'
+
+
+def test_strip_brackets_parens():
+    assert strip_brackets_parens('[[a]] (b)') == 'a b'
+
+
+# Every string of up to four pieces that matter to the patterns gives the same result as the regex chain
+def test_same_as_legacy_on_combinations():
+    pieces = ['a', ' ', ', ', '(', ')', '[', ']', '<sub>1</sub>', '<sup>2</sup>', '.', '&lt;sub&gt;x&lt;/sub&gt;',
+              '&lt;sup&gt;&lt;/sup&gt;', '<sub>', '</sub>', '\t']
+    for n in range(1, 5):
+        for combination in itertools.product(pieces, repeat=n):
+            string = ''.join(combination)
+            assert normalize_src_word(string) == legacy_src_word(string), string
+            assert normalize_tr(string) == legacy_tr(string), string